@@ -0,0 +1,72 @@
+"""Shared thread pool for concurrent SSM API calls."""
+
+from __future__ import annotations
+
+import functools
+import os
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# SSM calls are bound by API latency and the account's TPS budget, not by
+# CPU, so the pool is sized for network concurrency rather than core count.
+# Set SSMTREE_CONCURRENCY to throttle against a tighter TPS limit.
+_DEFAULT_CONCURRENCY = 16
+
+
+def _concurrency() -> int:
+    """Return the worker count from ``SSMTREE_CONCURRENCY`` (default 16)."""
+    raw = os.environ.get("SSMTREE_CONCURRENCY", "")
+    try:
+        value = int(raw)
+    except ValueError:
+        return _DEFAULT_CONCURRENCY
+    return max(value, 1)
+
+
+@functools.cache
+def pool_size() -> int:
+    """Return the worker count of :func:`network_pool`, fixed at first use."""
+    return _concurrency()
+
+
+@functools.cache
+def network_pool() -> ThreadPoolExecutor:
+    """Return the process-wide executor used for fetch and copy fan-out.
+
+    Created on first use so commands that never fan out pay nothing; worker
+    threads are themselves started lazily as work is submitted.  Fan work out
+    through :func:`bounded_map` rather than submitting it in bulk, so that an
+    interrupted caller does not leave a backlog running in the shared pool.
+    Submitting a single call directly is fine as long as its future is
+    cancelled in a ``finally`` block, as the leaf lookup in
+    :func:`ssmtree.fetcher._iter_items` does.
+    """
+    return ThreadPoolExecutor(max_workers=pool_size(), thread_name_prefix="ssmtree")
+
+
+def bounded_map(fn: Callable[[_T], _R], items: Iterable[_T]) -> Generator[_R, None, None]:
+    """Yield ``fn(item)`` for each of *items*, in order, run on :func:`network_pool`.
+
+    At most :func:`pool_size` calls are submitted at a time, and a new call is
+    only queued once the oldest result has been taken.  When the iterator is
+    closed early, or a call raises, calls that have not started are cancelled,
+    so no more than the calls already in flight run to completion.
+    """
+    pool = network_pool()
+    window = pool_size()
+    pending: deque[Future[_R]] = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -2,36 +2,55 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import re
+import string
 import sys
-from typing import TYPE_CHECKING, NoReturn
+from collections.abc import Iterable, Iterator
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, NoReturn
 
 import click
-from rich.console import Console
-from rich.markup import escape
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised via the _HAVE_ORJSON flag
+    _HAVE_ORJSON = False
+else:
+    _HAVE_ORJSON = True
 
 if TYPE_CHECKING:
     from mypy_boto3_ssm import SSMClient
+    from rich.console import Console
 
 from ssmtree import __version__
 from ssmtree.copier import copy_namespace
 from ssmtree.differ import diff_namespaces
 from ssmtree.errors import ClientCreationError
-from ssmtree.fetcher import FetchError, fetch_parameters, make_client
-from ssmtree.formatters import render_copy_plan, render_diff, render_tree
+from ssmtree.fetcher import FetchError, fetch_parameters, fetch_parameters_raw, make_client
 from ssmtree.putter import PutError, put_parameter
-from ssmtree.tree import build_tree, filter_tree
-
-console = Console()
-err_console = Console(stderr=True)
 
 _REDACTED = "***REDACTED***"
-_SSM_PATH_RE = re.compile(r"^(?:/[a-zA-Z0-9_.-]+)+$")
+_SSM_PATH_RE = re.compile(r"^(?:/[a-zA-Z0-9_.-]+)+$", re.ASCII)
+_SSM_PATH_CHARS = frozenset(string.ascii_letters + string.digits + "_.-/")
+
+
+# rich, the formatters, and the tree builder are imported where they are used
+# so that `ssmtree --help` / `--version` only pay for click.
+
+
+@functools.cache
+def _console(stderr: bool = False) -> Console:
+    from rich.console import Console
+
+    return Console(stderr=stderr)
 
 
 def _abort(msg: str) -> NoReturn:
-    console.print(f"[bold red]Error:[/] {escape(msg)}")
+    from rich.markup import escape
+
+    _console().print(f"[bold red]Error:[/] {escape(msg)}")
     sys.exit(1)
 
 
@@ -49,6 +68,15 @@ def _validate_path(path: str) -> None:
     """Validate that *path* looks like a valid SSM parameter path."""
     if path == "/":
         return
+    # Fast path for well-formed paths: allowed characters only, no empty
+    # segments.  Anything else falls through to the regex and its message.
+    if (
+        path.startswith("/")
+        and not path.endswith("/")
+        and "//" not in path
+        and _SSM_PATH_CHARS.issuperset(path)
+    ):
+        return
     if not path or not path.strip():
         _abort("Path must not be empty.")
     if not _SSM_PATH_RE.match(path):
@@ -58,6 +86,62 @@ def _validate_path(path: str) -> None:
         )
 
 
+def _json_bytes(obj: Any) -> bytes:
+    """Encode *obj* as indented JSON.
+
+    Uses ``orjson`` when installed (``pip install ssmtree[fast]``) and falls
+    back to the stdlib encoder otherwise.  orjson always emits raw UTF-8, so
+    the fallback disables ``ensure_ascii`` and the two produce identical bytes.
+    """
+    if _HAVE_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+
+
+def _iter_json_array(items: Iterable[Any], depth: int = 0) -> Iterator[bytes]:
+    """Encode *items* as a JSON array one element at a time.
+
+    The concatenated chunks match ``_json_bytes(list(items))`` nested
+    *depth* levels deep, without the encoded document ever existing as one
+    buffer (the decoded items are the caller's to hold).  Re-indenting by
+    replacing newlines is safe because JSON escapes newlines inside strings.
+    """
+    pad = b"  " * (depth + 1)
+    opener = b"[\n"
+    for item in items:
+        yield opener + pad + _json_bytes(item).replace(b"\n", b"\n" + pad)
+        opener = b",\n"
+    if opener == b"[\n":
+        yield b"[]"
+    else:
+        yield b"\n" + b"  " * depth + b"]"
+
+
+def _iter_json_object(sections: dict[str, Iterable[Any]]) -> Iterator[bytes]:
+    """Encode a JSON object whose values are arrays, one element at a time."""
+    separator = b"{\n"
+    for key, items in sections.items():
+        yield separator + b"  " + _json_bytes(key) + b": "
+        yield from _iter_json_array(items, depth=1)
+        separator = b",\n"
+    yield b"\n}" if sections else b"{}"
+
+
+def _write_json(chunks: Iterable[bytes]) -> None:
+    """Stream encoded JSON *chunks* to stdout, followed by a newline.
+
+    Chunks go straight to the binary stream, skipping the text layer's
+    re-encode, and are never joined into one encoded document.  Peak memory
+    is still dominated by the records being encoded, which callers collect
+    and sort first.
+    """
+    stdout = click.get_binary_stream("stdout")
+    for chunk in chunks:
+        stdout.write(chunk)
+    stdout.write(b"\n")
+    stdout.flush()
+
+
 def _redact_value(param_type: str, value: str, include_secrets: bool) -> str:
     """Return value or redacted placeholder for SecureString parameters."""
     if param_type == "SecureString" and not include_secrets:
@@ -167,10 +251,37 @@ def main(
     if ctx.invoked_subcommand is not None:
         return
 
+    console = _console()
+    err_console = _console(stderr=True)
+
     # PATH is an optional trailing positional arg collected in ctx.args
     path = ctx.args[0] if ctx.args else "/"
     _validate_path(path)
 
+    if output == "json":
+        if include_secrets:
+            err_console.print(
+                "[bold yellow]WARNING:[/] Secret values will be included in output.",
+            )
+        # Serialize straight from the fetched dicts; no Parameter objects or
+        # tree are needed for JSON.
+        data: list[dict[str, Any]] = []
+        try:
+            for record in fetch_parameters_raw(
+                path, decrypt=decrypt, profile=profile, region=region, endpoint_url=endpoint_url
+            ):
+                del record["last_modified"]
+                record["value"] = _redact_value(record["type"], record["value"], include_secrets)
+                data.append(record)
+        except FetchError as exc:
+            _abort(str(exc))
+        # Output is ordered by path while fetches arrive unordered, so every
+        # record is collected before encoding starts; only the encoded bytes
+        # are produced incrementally.
+        data.sort(key=itemgetter("path"))
+        _write_json(_iter_json_array(data))
+        return
+
     try:
         params = fetch_parameters(
             path, decrypt=decrypt, profile=profile, region=region, endpoint_url=endpoint_url
@@ -178,31 +289,15 @@ def main(
     except FetchError as exc:
         _abort(str(exc))
 
+    from ssmtree.formatters import render_tree
+    from ssmtree.tree import build_tree, filter_tree
+
+    tree = build_tree(params, root_path=path)
     if filter_pattern:
-        tree = build_tree(params, root_path=path)
         tree = filter_tree(tree, filter_pattern)
-    else:
-        tree = build_tree(params, root_path=path)
 
-    if output == "json":
-        if include_secrets:
-            err_console.print(
-                "[bold yellow]WARNING:[/] Secret values will be included in output.",
-            )
-        data = [
-            {
-                "path": p.path,
-                "name": p.name,
-                "value": _redact_value(p.type, p.value, include_secrets),
-                "type": p.type,
-                "version": p.version,
-            }
-            for p in params
-        ]
-        click.echo(json.dumps(data, indent=2, default=str))
-    else:
-        rich_tree = render_tree(tree, show_values=show_values, decrypt=decrypt)
-        console.print(rich_tree)
+    rich_tree = render_tree(tree, show_values=show_values, decrypt=decrypt)
+    console.print(rich_tree)
 
 
 @main.command("diff")
@@ -250,6 +345,8 @@ def diff_cmd(
     """
     _validate_path(path1)
     _validate_path(path2)
+    console = _console()
+    err_console = _console(stderr=True)
 
     try:
         params1 = fetch_parameters(
@@ -268,24 +365,24 @@ def diff_cmd(
             err_console.print(
                 "[bold yellow]WARNING:[/] Secret values will be included in output.",
             )
-        data = {
-            "added": [
+        sections: dict[str, Iterable[dict[str, Any]]] = {
+            "added": (
                 {
                     "path": p.path,
                     "value": _redact_value(p.type, p.value, include_secrets),
                     "type": p.type,
                 }
                 for p in added
-            ],
-            "removed": [
+            ),
+            "removed": (
                 {
                     "path": p.path,
                     "value": _redact_value(p.type, p.value, include_secrets),
                     "type": p.type,
                 }
                 for p in removed
-            ],
-            "changed": [
+            ),
+            "changed": (
                 {
                     "path": old.path,
                     "old_value": _redact_value(old.type, old.value, include_secrets),
@@ -293,10 +390,12 @@ def diff_cmd(
                     "type": old.type,
                 }
                 for old, new in changed
-            ],
+            ),
         }
-        click.echo(json.dumps(data, indent=2))
+        _write_json(_iter_json_object(sections))
     else:
+        from ssmtree.formatters import render_diff
+
         if not added and not removed and not changed:
             console.print("[bold green]Namespaces are identical.[/]")
         else:
@@ -347,8 +446,11 @@ def copy_cmd(
       ssmtree copy --yes --overwrite /app/prod /app/staging
       ssmtree copy --decrypt --kms-key-id alias/my-key /app/prod /app/staging
     """
+    from rich.markup import escape
+
     _validate_path(source)
     _validate_path(dest)
+    console = _console()
 
     try:
         params = fetch_parameters(
@@ -373,6 +475,8 @@ def copy_cmd(
         )
 
     if dry_run:
+        from ssmtree.formatters import render_copy_plan
+
         table = render_copy_plan(params, source, dest)
         console.print(table)
         console.print(f"\n[dim]Dry run: {len(params)} parameter(s) would be copied.[/]")
@@ -405,9 +509,11 @@ def copy_cmd(
         f"from {escape(source)} \u2192 {escape(dest)}"
     )
     if failed:
-        console.print(f"[bold red]Failed {len(failed)} parameter(s):[/]")
-        for path, err in failed:
-            console.print(f"  {escape(path)}: {escape(err)}")
+        # One print for the whole report: each console.print call re-parses
+        # markup and re-renders, which adds up across many failures.
+        lines = [f"[bold red]Failed {len(failed)} parameter(s):[/]"]
+        lines.extend(f"  {escape(path)}: {escape(err)}" for path, err in failed)
+        console.print("\n".join(lines))
         sys.exit(1)
 
 
@@ -470,9 +576,13 @@ def put_cmd(
       ssmtree put --overwrite --yes /app/prod/db/host new-host
       ssmtree put --type StringList /app/prod/ips "10.0.0.1,10.0.0.2"
     """
+    from rich.markup import escape
+
     _validate_path(path)
     if path == "/":
         _abort("Cannot create a parameter at the root path '/'.")
+    console = _console()
+    err_console = _console(stderr=True)
 
     if secure:
         param_type = "SecureString"
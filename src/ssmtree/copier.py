@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from contextlib import closing
 from typing import TYPE_CHECKING, Any
 
 from botocore.exceptions import BotoCoreError, ClientError
-from rich.console import Console
-from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
+from ssmtree._pool import bounded_map
 from ssmtree.errors import sanitize_error
 from ssmtree.models import Parameter
 
@@ -19,14 +20,49 @@ class CopyError(Exception):
     """Raised when the entire copy operation cannot proceed."""
 
 
-def _rewrite_path(path: str, source_prefix: str, dest_prefix: str) -> str:
-    source_prefix = source_prefix.rstrip("/")
-    dest_prefix = dest_prefix.rstrip("/")
-    if path.startswith(source_prefix + "/"):
-        return dest_prefix + path[len(source_prefix) :]
-    if path == source_prefix:
-        return dest_prefix
-    return path
+def _path_rewriter(source_prefix: str, dest_prefix: str) -> Callable[[str], str]:
+    """Return a function mapping a path under *source_prefix* to *dest_prefix*.
+
+    The prefixes are normalized once up front rather than on every call.
+    """
+    src = source_prefix.rstrip("/")
+    dst = dest_prefix.rstrip("/")
+    src_slash = src + "/"
+    src_len = len(src)
+
+    def rewrite(path: str) -> str:
+        if path.startswith(src_slash) or path == src:
+            return dst + path[src_len:]
+        return path
+
+    return rewrite
+
+
+def _put(
+    ssm_client: SSMClient,
+    param: Parameter,
+    dest_path: str,
+    overwrite: bool,
+    kms_key_id: str | None,
+) -> str | None:
+    """Write *param* to *dest_path*; return a sanitized error message on failure."""
+    put_kwargs: dict[str, Any] = {
+        "Name": dest_path,
+        "Value": param.value,
+        "Type": param.type,
+        "Overwrite": overwrite,
+    }
+    if param.type == "SecureString" and kms_key_id:
+        put_kwargs["KeyId"] = kms_key_id
+
+    try:
+        ssm_client.put_parameter(**put_kwargs)
+    except ClientError as exc:
+        error_msg = exc.response["Error"].get("Message", "Unknown error")
+        return sanitize_error(error_msg, param.value)
+    except BotoCoreError as exc:
+        return f"AWS API error ({type(exc).__name__})"
+    return None
 
 
 def copy_namespace(
@@ -42,9 +78,13 @@ def copy_namespace(
 
     Each parameter's path is rewritten: the *source_prefix* portion is
     replaced with *dest_prefix* while the relative suffix is preserved.
+    Writes are issued concurrently, a bounded window at a time, so an
+    interrupt (e.g. Ctrl-C) stops the copy once the writes already in flight
+    finish.  Results are reported in the order of *source_params*, which
+    :func:`~ssmtree.fetcher.fetch_parameters` already returns sorted by path.
 
     Args:
-        source_params:  Parameters fetched from *source_prefix*.
+        source_params:  Parameters fetched from *source_prefix*, sorted by path.
         source_prefix:  The prefix to strip when rewriting paths.
         dest_prefix:    The new prefix to prepend.
         ssm_client:     A boto3 SSM client.
@@ -60,14 +100,15 @@ def copy_namespace(
 
         On dry-run, returns ``(planned_paths, [])``.
     """
-    planned: list[str] = []
-    for param in sorted(source_params, key=lambda p: p.path):
-        dest_path = _rewrite_path(param.path, source_prefix, dest_prefix)
-        planned.append(dest_path)
+    rewrite = _path_rewriter(source_prefix, dest_prefix)
+    planned = [rewrite(param.path) for param in source_params]
 
     if dry_run:
         return planned, []
 
+    from rich.console import Console
+    from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
+
     console = Console()
     written: list[str] = []
     failed: list[tuple[str, str]] = []
@@ -82,24 +123,17 @@ def copy_namespace(
     ) as progress:
         task = progress.add_task("Copying parameters…", total=len(source_params))
 
-        for param, dest_path in zip(sorted(source_params, key=lambda p: p.path), planned):
-            put_kwargs: dict[str, Any] = {
-                "Name": dest_path,
-                "Value": param.value,
-                "Type": param.type,
-                "Overwrite": overwrite,
-            }
-            if param.type == "SecureString" and kms_key_id:
-                put_kwargs["KeyId"] = kms_key_id
-
-            try:
-                ssm_client.put_parameter(**put_kwargs)
-                written.append(dest_path)
-            except ClientError as exc:
-                error_msg = exc.response["Error"].get("Message", "Unknown error")
-                failed.append((dest_path, sanitize_error(error_msg, param.value)))
-            except BotoCoreError as exc:
-                failed.append((dest_path, f"AWS API error ({type(exc).__name__})"))
-            progress.advance(task)
+        def put(pair: tuple[Parameter, str]) -> str | None:
+            return _put(ssm_client, pair[0], pair[1], overwrite, kms_key_id)
+
+        # closing() cancels any queued writes as soon as the loop is left,
+        # rather than when the generator happens to be garbage collected.
+        with closing(bounded_map(put, zip(source_params, planned))) as errors:
+            for dest_path, error in zip(planned, errors):
+                if error is None:
+                    written.append(dest_path)
+                else:
+                    failed.append((dest_path, error))
+                progress.advance(task)
 
     return written, failed
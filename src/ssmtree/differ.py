@@ -2,14 +2,21 @@
 
 from __future__ import annotations
 
+from operator import attrgetter, itemgetter
+
 from ssmtree.models import Parameter
 
 
-def _relative(path: str, prefix: str) -> str:
-    prefix = prefix.rstrip("/")
-    if path.startswith(prefix + "/"):
-        return path[len(prefix) + 1 :]
-    return path
+def _keyed(params: list[Parameter], prefix: str) -> list[tuple[str, Parameter]]:
+    """Pair each parameter with its relative key, ordered by key.
+
+    Fetched parameters arrive sorted by path, which is already key order, so
+    the sort is a single linear pass in practice.
+    """
+    prefix_slash = prefix.rstrip("/") + "/"
+    keyed = [(p.path.removeprefix(prefix_slash), p) for p in params]
+    keyed.sort(key=itemgetter(0))
+    return keyed
 
 
 def diff_namespaces(
@@ -37,18 +44,37 @@ def diff_namespaces(
         * ``removed`` — parameters in *params1* not present in *params2*.
         * ``changed`` — ``(old, new)`` pairs where the value differs.
     """
-    map1: dict[str, Parameter] = {_relative(p.path, path1): p for p in params1}
-    map2: dict[str, Parameter] = {_relative(p.path, path2): p for p in params2}
-
-    keys1 = set(map1)
-    keys2 = set(map2)
-
-    removed = [map1[k] for k in sorted(keys1 - keys2)]
-    added = [map2[k] for k in sorted(keys2 - keys1)]
-    changed: list[tuple[Parameter, Parameter]] = [
-        (map1[k], map2[k])
-        for k in sorted(keys1 & keys2)
-        if map1[k].value != map2[k].value
-    ]
+    keyed1 = _keyed(params1, path1)
+    keyed2 = _keyed(params2, path2)
+
+    # Sorted-merge walk over both key-ordered sequences.
+    added: list[Parameter] = []
+    removed: list[Parameter] = []
+    changed: list[tuple[Parameter, Parameter]] = []
+    i = j = 0
+    n1, n2 = len(keyed1), len(keyed2)
+    while i < n1 and j < n2:
+        key1, old = keyed1[i]
+        key2, new = keyed2[j]
+        if key1 == key2:
+            if old.value != new.value:
+                changed.append((old, new))
+            i += 1
+            j += 1
+        elif key1 < key2:
+            removed.append(old)
+            i += 1
+        else:
+            added.append(new)
+            j += 1
+    removed.extend(p for _, p in keyed1[i:])
+    added.extend(p for _, p in keyed2[j:])
+
+    # Key order matches path order except for a parameter stored exactly at
+    # the prefix; these sorts just restore that and are linear otherwise.
+    by_path = attrgetter("path")
+    removed.sort(key=by_path)
+    added.sort(key=by_path)
+    changed.sort(key=lambda pair: pair[0].path)
 
     return added, removed, changed
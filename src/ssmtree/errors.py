@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import re
 
-_ARN_RE = re.compile(r"arn:aws[a-zA-Z-]*:[a-zA-Z0-9-]+:\S+")
-_ACCOUNT_RE = re.compile(r"\b\d{12}\b")
+# ARNs and bare 12-digit account IDs, matched in one pass.  Group 1 is the
+# ARN alternative; anything else matched is an account ID.
+_SENSITIVE_RE = re.compile(r"(arn:aws[a-zA-Z-]*:[a-zA-Z0-9-]+:\S+)|\b\d{12}\b")
+
+
+def _redact(match: re.Match[str]) -> str:
+    return "arn:***" if match.group(1) else "***"
 
 
 class ClientCreationError(Exception):
@@ -22,8 +27,8 @@ def sanitize_error(msg: str, value: str | None = None) -> str:
     write errors may echo the parameter value. This scrubs all three so error
     output shown to the user does not leak identifiers or secrets.
     """
-    msg = _ARN_RE.sub("arn:***", msg)
-    msg = _ACCOUNT_RE.sub("***", msg)
+    if "arn:" in msg or any(map(str.isdigit, msg)):
+        msg = _SENSITIVE_RE.sub(_redact, msg)
     if value:
         msg = msg.replace(value, "***")
     return msg
@@ -2,26 +2,32 @@
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Any
 
-import boto3
-from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from ssmtree._pool import bounded_map, network_pool
 from ssmtree.errors import ClientCreationError, sanitize_error
 from ssmtree.models import Parameter
 
 if TYPE_CHECKING:
     from mypy_boto3_ssm import SSMClient
+    from mypy_boto3_ssm.type_defs import ParameterTypeDef
 
 
 class FetchError(Exception):
     """Raised when the SSM API call fails."""
 
 
-_RETRY_CONFIG = Config(retries={"max_attempts": 5, "mode": "adaptive"})
+# GetParametersByPath and GetParameters both return at most 10 parameters per
+# call; DescribeParameters lists up to 50 names per page.
+_PAGE_SIZE = 10
+_DESCRIBE_PAGE_SIZE = 50
 
 
+@functools.lru_cache(maxsize=8)
 def make_client(
     profile: str | None,
     region: str | None,
@@ -29,6 +35,11 @@ def make_client(
 ) -> SSMClient:
     """Create a boto3 SSM client with retry configuration.
 
+    Clients are cached per ``(profile, region, endpoint_url)``, so repeated
+    calls in one process (e.g. the two fetches behind ``diff``) share a single
+    client.  boto3 is imported here rather than at module load so that
+    ``ssmtree --help`` and ``--version`` never pay for it.
+
     Args:
         profile:      AWS named profile to use.
         region:       AWS region override.
@@ -39,13 +50,145 @@ def make_client(
             resolved.  Callers surface this as a clean message rather than
             letting a raw botocore traceback reach the user.
     """
+    import boto3
+    from botocore.config import Config
+
     try:
         session = boto3.Session(profile_name=profile, region_name=region)
-        return session.client("ssm", config=_RETRY_CONFIG, endpoint_url=endpoint_url)
+        retry_config = Config(retries={"max_attempts": 5, "mode": "adaptive"})
+        return session.client("ssm", config=retry_config, endpoint_url=endpoint_url)
     except BotoCoreError as exc:
         raise ClientCreationError(sanitize_error(str(exc))) from exc
 
 
+def _list_names(client: SSMClient, prefix: str) -> list[str]:
+    """List every parameter name under *prefix* via DescribeParameters (no values)."""
+    paginator = client.get_paginator("describe_parameters")
+    pages = paginator.paginate(
+        ParameterFilters=[{"Key": "Path", "Option": "Recursive", "Values": [prefix]}],
+        PaginationConfig={"PageSize": _DESCRIBE_PAGE_SIZE},
+    )
+    return [meta["Name"] for page in pages for meta in page.get("Parameters", [])]
+
+
+def _get_batch(client: SSMClient, decrypt: bool, names: list[str]) -> list[ParameterTypeDef]:
+    response = client.get_parameters(Names=names, WithDecryption=decrypt)
+    return response.get("Parameters", [])
+
+
+def _is_access_denied(exc: ClientError) -> bool:
+    return exc.response["Error"]["Code"] == "AccessDeniedException"
+
+
+def _page_by_token(
+    client: SSMClient, kwargs: dict[str, Any], next_token: str, skip: set[str]
+) -> Iterator[ParameterTypeDef]:
+    """Walk the remaining GetParametersByPath pages, omitting names in *skip*."""
+    token: str | None = next_token
+    while token:
+        kwargs["NextToken"] = token
+        response = client.get_parameters_by_path(**kwargs)
+        for item in response.get("Parameters", []):
+            if item["Name"] not in skip:
+                yield item
+        token = response.get("NextToken")
+
+
+def _iter_pages(client: SSMClient, prefix: str, decrypt: bool) -> Iterator[ParameterTypeDef]:
+    """Yield every parameter under *prefix* (recursive), in no particular order.
+
+    Small namespaces are served by a single GetParametersByPath page.  When
+    more pages remain, the rest of the names are enumerated with
+    DescribeParameters (50 per page rather than 10) and their values fetched
+    in parallel GetParameters batches, instead of walking ``NextToken`` one
+    round-trip at a time.  Callers without ``ssm:DescribeParameters`` or
+    ``ssm:GetParameters`` fall back to serial pagination.
+    """
+    kwargs: dict[str, Any] = {
+        "Path": prefix,
+        "Recursive": True,
+        "WithDecryption": decrypt,
+        "MaxResults": _PAGE_SIZE,
+    }
+    response = client.get_parameters_by_path(**kwargs)
+    first_page = response.get("Parameters", [])
+    yield from first_page
+    next_token = response.get("NextToken")
+    if not next_token:
+        return
+
+    try:
+        names = _list_names(client, prefix)
+    except ClientError as exc:
+        if not _is_access_denied(exc):
+            raise
+        yield from _page_by_token(client, kwargs, next_token, set())
+        return
+
+    fetched = {item["Name"] for item in first_page}
+    pending = [name for name in names if name not in fetched]
+    batches = [pending[i : i + _PAGE_SIZE] for i in range(0, len(pending), _PAGE_SIZE)]
+    done = 0
+    try:
+        for items in bounded_map(functools.partial(_get_batch, client, decrypt), batches):
+            yield from items
+            done += 1
+    except ClientError as exc:
+        if not _is_access_denied(exc):
+            raise
+        # Page through from where the first page left off, skipping whatever
+        # the batches that did succeed have already yielded.
+        yield from _page_by_token(client, kwargs, next_token, set().union(*batches[:done]))
+
+
+def _get_leaf(client: SSMClient, prefix: str, decrypt: bool) -> ParameterTypeDef | None:
+    """Return the parameter stored exactly at *prefix*, or ``None`` if there is none."""
+    try:
+        return client.get_parameter(Name=prefix, WithDecryption=decrypt)["Parameter"]
+    except ClientError as exc:
+        if exc.response["Error"]["Code"] == "ParameterNotFound":
+            return None
+        raise
+
+
+def _iter_items(client: SSMClient, prefix: str, decrypt: bool) -> Iterator[ParameterTypeDef]:
+    """Yield the raw boto3 parameter dicts under *prefix*, in API order.
+
+    Raises:
+        FetchError: On any AWS API error.
+    """
+    # get_parameters_by_path never returns a parameter AT the prefix path itself
+    # (only parameters under it).  Look it up with get_parameter as well so that
+    # e.g. `ssmtree /app/db/password` works when that is a leaf parameter; the
+    # lookup runs alongside the path fetch so it costs no extra round-trip.
+    leaf = network_pool().submit(_get_leaf, client, prefix, decrypt) if prefix != "/" else None
+    prefix_seen = False
+    try:
+        for item in _iter_pages(client, prefix, decrypt):
+            if item["Name"] == prefix:
+                prefix_seen = True
+            yield item
+        param = leaf.result() if leaf is not None else None
+    except (ClientError, BotoCoreError) as exc:
+        sanitized = sanitize_error(str(exc))
+        raise FetchError(f"Failed to fetch parameters from SSM: {sanitized}") from exc
+    finally:
+        if leaf is not None:
+            leaf.cancel()
+
+    if param is not None and not prefix_seen:
+        yield param
+
+
+def _client_for_fetch(
+    profile: str | None, region: str | None, endpoint_url: str | None
+) -> SSMClient:
+    try:
+        return make_client(profile, region, endpoint_url)
+    except ClientCreationError as exc:
+        raise FetchError(str(exc)) from exc
+
+
 def fetch_parameters(
     prefix: str,
     decrypt: bool = False,
@@ -69,75 +212,55 @@ def fetch_parameters(
         FetchError: On any AWS API error, including client-creation failures
             such as an unknown profile or unresolved region.
     """
-    try:
-        client = make_client(profile, region, endpoint_url)
-    except ClientCreationError as exc:
-        raise FetchError(str(exc)) from exc
+    client = _client_for_fetch(profile, region, endpoint_url)
 
     params: list[Parameter] = []
-    kwargs: dict[str, Any] = {
-        "Path": prefix,
-        "Recursive": True,
-        "WithDecryption": decrypt,
-    }
+    append = params.append  # bound once; this loop runs per parameter
+    for item in _iter_items(client, prefix, decrypt):
+        path = item["Name"]
+        append(
+            Parameter(
+                path=path,
+                name=path.rpartition("/")[2] or path,
+                value=item.get("Value", ""),
+                type=item.get("Type", "String"),
+                version=item.get("Version", 0),
+                last_modified=item.get("LastModifiedDate"),
+            )
+        )
 
-    try:
-        while True:
-            response = client.get_parameters_by_path(**kwargs)
-            for item in response.get("Parameters", []):
-                path = item["Name"]
-                segments = [s for s in path.split("/") if s]
-                name = segments[-1] if segments else path
-                params.append(
-                    Parameter(
-                        path=path,
-                        name=name,
-                        value=item.get("Value", ""),
-                        type=item.get("Type", "String"),
-                        version=item.get("Version", 0),
-                        last_modified=item.get("LastModifiedDate"),
-                    )
-                )
-            next_token = response.get("NextToken")
-            if not next_token:
-                break
-            kwargs["NextToken"] = next_token
-    except (ClientError, BotoCoreError) as exc:
-        sanitized = sanitize_error(str(exc))
-        raise FetchError(f"Failed to fetch parameters from SSM: {sanitized}") from exc
+    return sorted(params, key=lambda p: p.path)
 
-    # get_parameters_by_path never returns a parameter AT the prefix path itself
-    # (only parameters under it).  Try get_parameter as a fallback so that
-    # e.g. `ssmtree /app/db/password` works when that is a leaf parameter.
-    if prefix != "/":
-        existing_paths = {p.path for p in params}
-        if prefix not in existing_paths:
-            try:
-                resp = client.get_parameter(Name=prefix, WithDecryption=decrypt)
-                item = resp["Parameter"]
-                path = item["Name"]
-                segments = [s for s in path.split("/") if s]
-                name = segments[-1] if segments else path
-                params.append(
-                    Parameter(
-                        path=path,
-                        name=name,
-                        value=item.get("Value", ""),
-                        type=item.get("Type", "String"),
-                        version=item.get("Version", 0),
-                        last_modified=item.get("LastModifiedDate"),
-                    )
-                )
-            except ClientError as exc:
-                if exc.response["Error"]["Code"] != "ParameterNotFound":
-                    sanitized = sanitize_error(str(exc))
-                    raise FetchError(
-                        f"Failed to fetch parameters from SSM: {sanitized}"
-                    ) from exc
-            except BotoCoreError as exc:
-                sanitized = sanitize_error(str(exc))
-                raise FetchError(
-                    f"Failed to fetch parameters from SSM: {sanitized}"
-                ) from exc
 
-    return sorted(params, key=lambda p: p.path)
+def fetch_parameters_raw(
+    prefix: str,
+    decrypt: bool = False,
+    profile: str | None = None,
+    region: str | None = None,
+    endpoint_url: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield SSM parameters under *prefix* as plain dicts.
+
+    A lighter-weight sibling of :func:`fetch_parameters` for callers that only
+    serialize the result (e.g. ``--output json``): no :class:`Parameter`
+    objects are built.  Each dict has the same keys as :class:`Parameter`'s
+    fields and is freshly allocated, so callers may mutate it.
+
+    Unlike :func:`fetch_parameters`, results are yielded in API order, not
+    sorted, and errors surface while iterating.
+
+    Raises:
+        FetchError: On any AWS API error, including client-creation failures.
+    """
+    client = _client_for_fetch(profile, region, endpoint_url)
+
+    for item in _iter_items(client, prefix, decrypt):
+        path = item["Name"]
+        yield {
+            "path": path,
+            "name": path.rpartition("/")[2] or path,
+            "value": item.get("Value", ""),
+            "type": item.get("Type", "String"),
+            "version": item.get("Version", 0),
+            "last_modified": item.get("LastModifiedDate"),
+        }
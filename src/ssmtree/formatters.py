@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from operator import attrgetter
+
 from rich.markup import escape
 from rich.table import Table
 from rich.text import Text
@@ -11,11 +14,19 @@ from ssmtree.models import Parameter, TreeNode
 
 _MAX_VALUE_LEN = 60
 
+_path_key = attrgetter("path")
+
+# Filler for the unused value column of added/removed diff rows; Rich only
+# reads cell renderables, so one instance is shared by every row.
+_EMPTY_TEXT = Text("")
 
-def _truncate(value: str) -> str:
-    if len(value) <= _MAX_VALUE_LEN:
-        return value
-    return value[:_MAX_VALUE_LEN] + "…"
+
+def _plain_value(param: Parameter) -> str:
+    """Return *param*'s value, truncated to :data:`_MAX_VALUE_LEN` characters."""
+    # The length check and slice are written out rather than calling a helper:
+    # this runs once per displayed value.
+    value = param.value
+    return value if len(value) <= _MAX_VALUE_LEN else value[:_MAX_VALUE_LEN] + "…"
 
 
 _REDACTED_LABEL = "[redacted]"
@@ -25,24 +36,30 @@ def _display_value(param: Parameter, decrypt: bool) -> str:
     """Return the value to display, or the redacted placeholder for undecrypted SecureStrings."""
     if param.is_secure and not decrypt:
         return _REDACTED_LABEL
-    return _truncate(param.value)
+    return _plain_value(param)
+
+
+def _value_getter(decrypt: bool) -> Callable[[Parameter], str]:
+    """Return :func:`_display_value` specialised for a fixed *decrypt* flag."""
+    if decrypt:
+        return _plain_value
+    return lambda param: _REDACTED_LABEL if param.is_secure else _plain_value(param)
+
+
+# Per-type name style and pre-styled type tag for parameter labels.
+_NAME_STYLE = {
+    "String": "bold green",
+    "SecureString": "bold yellow",
+    "StringList": "bold cyan",
+}
+_TYPE_TAG_TEXT = {
+    param_type: Text(f" [{param_type}]", style="dim") for param_type in _NAME_STYLE
+}
 
 
 def _param_label(param: Parameter, show_values: bool, decrypt: bool = False) -> Text:
     """Build a Rich :class:`Text` label for a parameter leaf."""
-    if param.is_secure:
-        name_style = "bold yellow"
-        type_tag = "[SecureString]"
-    elif param.is_string_list:
-        name_style = "bold cyan"
-        type_tag = "[StringList]"
-    else:
-        name_style = "bold green"
-        type_tag = "[String]"
-
-    label = Text()
-    label.append(param.name, style=name_style)
-    label.append(f" {type_tag}", style="dim")
+    label = Text.assemble((param.name, _NAME_STYLE[param.type]), _TYPE_TAG_TEXT[param.type])
 
     if show_values:
         display = _display_value(param, decrypt)
@@ -53,24 +70,35 @@ def _param_label(param: Parameter, show_values: bool, decrypt: bool = False) ->
 
 
 def _add_node(rich_tree: Tree, node: TreeNode, show_values: bool, decrypt: bool = False) -> None:
-    """Recursively add *node*'s children to *rich_tree*."""
-    for child in sorted(node.children.values(), key=lambda n: n.name):
-        if child.is_namespace:
-            # Namespace node — bold blue, may also carry a parameter
-            branch_label = Text(child.name, style="bold blue")
-            if child.parameter is not None and show_values:
-                display = _display_value(child.parameter, decrypt)
-                style = "dim red italic" if display == _REDACTED_LABEL else "dim italic"
-                branch_label.append(f"  ({display})", style=style)
-            branch = rich_tree.add(branch_label)
-            _add_node(branch, child, show_values, decrypt)
-        else:
-            # Pure leaf node — must have a parameter
-            if child.parameter is not None:
-                rich_tree.add(_param_label(child.parameter, show_values, decrypt))
+    """Add every descendant of *node* to *rich_tree*.
+
+    Walks the tree iteratively rather than recursing.  Children are emitted in
+    dict order, which :func:`~ssmtree.tree.build_tree` guarantees is sorted by
+    name; each branch's children are added to that branch, so the order of the
+    walk itself does not affect the rendered output.
+    """
+    stack = [(rich_tree, node)]
+    while stack:
+        parent, current = stack.pop()
+        for child in current.children.values():
+            if child.is_namespace:
+                # Namespace node — bold blue, may also carry a parameter
+                if child.parameter is not None and show_values:
+                    branch_label = Text(child.name, style="bold blue")
+                    display = _display_value(child.parameter, decrypt)
+                    style = "dim red italic" if display == _REDACTED_LABEL else "dim italic"
+                    branch_label.append(f"  ({display})", style=style)
+                    branch = parent.add(branch_label)
+                else:
+                    # Plain label: a markup string, parsed only when rendered
+                    branch = parent.add(f"[bold blue]{escape(child.name)}[/]")
+                stack.append((branch, child))
+            elif child.parameter is not None:
+                # Pure leaf node — must have a parameter
+                parent.add(_param_label(child.parameter, show_values, decrypt))
             else:
                 # Orphan namespace with no param and no children (shouldn't happen)
-                rich_tree.add(Text(child.name, style="dim"))
+                parent.add(Text(child.name, style="dim"))
 
 
 def render_tree(root: TreeNode, show_values: bool = True, decrypt: bool = False) -> Tree:
@@ -126,28 +154,32 @@ def render_diff(
         table.add_column(escape(path1), style="red")
         table.add_column(escape(path2), style="green")
 
-    for param in sorted(removed, key=lambda p: p.path):
-        rel = _relative(param.path, path1)
-        if show_values:
-            table.add_row("removed", escape(rel), Text(_display_value(param, decrypt)), Text(""))
-        else:
-            table.add_row("removed", escape(rel))
-
-    for param in sorted(added, key=lambda p: p.path):
-        rel = _relative(param.path, path2)
-        if show_values:
-            table.add_row("added", escape(rel), Text(""), Text(_display_value(param, decrypt)))
-        else:
-            table.add_row("added", escape(rel))
-
-    for old, new in sorted(changed, key=lambda pair: pair[0].path):
-        rel = _relative(old.path, path1)
-        if show_values:
-            old_val = Text(_display_value(old, decrypt))
-            new_val = Text(_display_value(new, decrypt))
-            table.add_row("changed", escape(rel), old_val, new_val)
-        else:
-            table.add_row("changed", escape(rel))
+    # Inputs from diff_namespaces are already in path order, so each sort is a
+    # linear pass; copies are sorted rather than the caller's lists.
+    removed = sorted(removed, key=_path_key)
+    added = sorted(added, key=_path_key)
+    changed = sorted(changed, key=lambda pair: pair[0].path)
+
+    prefix1 = _prefix_slash(path1)
+    prefix2 = _prefix_slash(path2)
+    if show_values:
+        display = _value_getter(decrypt)
+        for param in removed:
+            rel = param.path.removeprefix(prefix1)
+            table.add_row("removed", escape(rel), Text(display(param)), _EMPTY_TEXT)
+        for param in added:
+            rel = param.path.removeprefix(prefix2)
+            table.add_row("added", escape(rel), _EMPTY_TEXT, Text(display(param)))
+        for old, new in changed:
+            rel = old.path.removeprefix(prefix1)
+            table.add_row("changed", escape(rel), Text(display(old)), Text(display(new)))
+    else:
+        for param in removed:
+            table.add_row("removed", escape(param.path.removeprefix(prefix1)))
+        for param in added:
+            table.add_row("added", escape(param.path.removeprefix(prefix2)))
+        for old, _new in changed:
+            table.add_row("changed", escape(old.path.removeprefix(prefix1)))
 
     # SecureString ciphertext is non-deterministic, so undecrypted secrets always
     # compare as "changed".  Flag that so the result is not read as a real diff.
@@ -182,8 +214,10 @@ def render_copy_plan(
     table.add_column("Dest Path", style="green")
     table.add_column("Type", style="dim")
 
-    for param in sorted(source_params, key=lambda p: p.path):
-        dest_path = dest_prefix.rstrip("/") + "/" + _relative(param.path, source_prefix)
+    source_slash = _prefix_slash(source_prefix)
+    dest_slash = _prefix_slash(dest_prefix)
+    for param in sorted(source_params, key=_path_key):
+        dest_path = dest_slash + param.path.removeprefix(source_slash)
         # Flag SecureString rows: they require --decrypt to copy the real value.
         type_cell: str | Text = (
             Text(f"{param.type} (needs --decrypt)", style="bold yellow")
@@ -195,9 +229,6 @@ def render_copy_plan(
     return table
 
 
-def _relative(path: str, prefix: str) -> str:
-    """Strip *prefix* from *path* to get the relative segment."""
-    prefix = prefix.rstrip("/")
-    if path.startswith(prefix + "/"):
-        return path[len(prefix) + 1 :]
-    return path
+def _prefix_slash(prefix: str) -> str:
+    """Return *prefix* normalised to end in exactly one ``/``, for ``str.removeprefix``."""
+    return prefix.rstrip("/") + "/"
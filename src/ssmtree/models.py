@@ -10,9 +10,14 @@ PARAMETER_TYPES = ("String", "SecureString", "StringList")
 ParameterType = Literal["String", "SecureString", "StringList"]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Parameter:
-    """Represents a single SSM Parameter Store parameter."""
+    """Represents a single SSM Parameter Store parameter.
+
+    Immutable and slotted: one is built per fetched parameter, so dropping the
+    per-instance ``__dict__`` matters on large namespaces, and freezing makes
+    instances hashable and safe to share.
+    """
 
     path: str              # full SSM path, e.g. /app/prod/db/password
     name: str              # leaf segment only, e.g. "password"
@@ -20,6 +25,9 @@ class Parameter:
     type: ParameterType    # "String" | "SecureString" | "StringList"
     version: int
     last_modified: datetime | None = None
+    # Derived from ``type`` once in __post_init__ rather than on every access.
+    is_secure: bool = field(init=False, repr=False, compare=False)
+    is_string_list: bool = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.type not in PARAMETER_TYPES:
@@ -27,19 +35,18 @@ class Parameter:
                 f"Invalid parameter type {self.type!r}; "
                 f"expected one of {PARAMETER_TYPES}"
             )
-
-    @property
-    def is_secure(self) -> bool:
-        return self.type == "SecureString"
-
-    @property
-    def is_string_list(self) -> bool:
-        return self.type == "StringList"
+        object.__setattr__(self, "is_secure", self.type == "SecureString")
+        object.__setattr__(self, "is_string_list", self.type == "StringList")
 
 
-@dataclass
+@dataclass(slots=True)
 class TreeNode:
-    """A node in the SSM parameter path tree."""
+    """A node in the SSM parameter path tree.
+
+    Slotted, since a tree holds at least one node per fetched parameter.
+    Trees built by :func:`~ssmtree.tree.build_tree` keep ``children`` in
+    name order.
+    """
 
     name: str                          # display label for this path segment
     path: str                          # full path up to (and including) this segment
@@ -3,9 +3,23 @@
 from __future__ import annotations
 
 import fnmatch
+import functools
+import os
+import re
+import sys
+from collections.abc import Callable
+from typing import Any
 
 from ssmtree.models import Parameter, TreeNode
 
+# A matcher returns a truthy value when the path matches the filter glob.
+_Matcher = Callable[[str], object]
+_GLOB_CHARS = frozenset("*?[")
+
+# fnmatch.fnmatch() normalises case (and separators) with os.path.normcase;
+# that is the identity on POSIX, so it is only applied where it matters.
+_NORMCASE = os.path.normcase("A/") != "A/"
+
 
 def build_tree(parameters: list[Parameter], root_path: str = "/") -> TreeNode:
     """Build a :class:`TreeNode` tree from a flat list of parameters.
@@ -20,16 +34,19 @@ def build_tree(parameters: list[Parameter], root_path: str = "/") -> TreeNode:
 
     Returns:
         Root :class:`TreeNode`.  Its ``children`` contain the top-level
-        segments relative to *root_path*.
+        segments relative to *root_path*.  Every node's ``children`` dict is
+        ordered by segment name, so renderers can iterate it without sorting.
     """
     root_path = root_path.rstrip("/") or "/"
     root = TreeNode(name=root_path, path=root_path)
 
-    # Index parameters by path for O(1) lookup when setting .parameter
-    param_by_path: dict[str, Parameter] = {p.path: p for p in parameters}
-
-    for param in parameters:
-        _insert(root, param, root_path, param_by_path)
+    # Insert in segment order so each children dict ends up name-ordered.
+    # This also inserts every parameter before any parameter beneath it, so
+    # a node that carries a parameter is always created by that parameter.
+    # Leading slashes are stripped as in _insert, so flat names like "foo"
+    # sort among the "/"-rooted ones under "/".
+    for param in sorted(parameters, key=lambda p: p.path.lstrip("/").split("/")):
+        _insert(root, param, root_path)
 
     return root
 
@@ -38,14 +55,21 @@ def _insert(
     root: TreeNode,
     param: Parameter,
     root_path: str,
-    param_by_path: dict[str, Parameter],
 ) -> None:
-    """Insert *param* into the tree rooted at *root*."""
+    """Insert *param* into the tree rooted at *root*.
+
+    Parameters must be inserted parents-first (see :func:`build_tree`):
+    intermediate nodes created here never carry a parameter.
+    """
     path = param.path
 
     # Strip the root prefix to get the relative path
     if root_path == "/":
         relative = path.lstrip("/")
+        if len(relative) + 1 != len(path):
+            # Flat ("foo") or multi-slash names: node paths are joined onto
+            # the root as "/" + segments, not sliced from the raw name.
+            path = "/" + relative
     else:
         if path.startswith(root_path + "/"):
             relative = path[len(root_path) + 1 :]
@@ -60,20 +84,33 @@ def _insert(
         return
 
     segments = relative.split("/")
+    leaf = segments.pop()
     current = root
-    accumulated_path = root_path.rstrip("/")
-
-    for i, segment in enumerate(segments):
-        accumulated_path = f"{accumulated_path}/{segment}"
-        if segment not in current.children:
-            # Create intermediate node; assign .parameter if one exists here
-            node = TreeNode(
-                name=segment,
-                path=accumulated_path,
-                parameter=param_by_path.get(accumulated_path),
-            )
-            current.children[segment] = node
-        current = current.children[segment]
+    # Every intermediate path is a prefix of path, so track where the
+    # current one ends and slice it out only when a node has to be created.
+    end = len(path) - len(relative) - 1
+
+    for segment in segments:
+        end += 1 + len(segment)
+        children = current.children
+        node = children.get(segment)
+        if node is None:
+            # Create intermediate (pure namespace) node.  Segment names repeat
+            # across many subtrees, so they are interned; paths are unique
+            # and are not.
+            segment = sys.intern(segment)
+            node = children[segment] = TreeNode(name=segment, path=path[:end])
+        current = node
+
+    # The terminal node carries the full path and param itself.  It
+    # only exists already for a repeated path, where the last one wins.
+    children = current.children
+    node = children.get(leaf)
+    if node is None:
+        leaf = sys.intern(leaf)
+        children[leaf] = TreeNode(name=leaf, path=path, parameter=param)
+    else:
+        node.parameter = param
 
 
 def filter_tree(root: TreeNode, pattern: str) -> TreeNode:
@@ -89,31 +126,95 @@ def filter_tree(root: TreeNode, pattern: str) -> TreeNode:
     Returns:
         A filtered copy of *root*.  Children that don't match are excluded.
     """
+    match = _compile_glob(pattern)
+    literal = _literal_prefix(pattern)
     filtered = TreeNode(name=root.name, path=root.path, parameter=root.parameter)
     for name, child in root.children.items():
-        filtered_child = _filter_node(child, pattern)
+        filtered_child = _filter_node(child, match, literal)
         if filtered_child is not None:
             filtered.children[name] = filtered_child
     return filtered
 
 
-def _filter_node(node: TreeNode, pattern: str) -> TreeNode | None:
-    """Recursively filter *node*.  Returns None if nothing matches."""
-    # Check if this node's own parameter matches
-    self_matches = node.parameter is not None and fnmatch.fnmatch(node.path, pattern)
-
-    # Recursively filter children
-    kept_children: dict[str, TreeNode] = {}
-    for name, child in node.children.items():
-        result = _filter_node(child, pattern)
-        if result is not None:
-            kept_children[name] = result
-
-    if self_matches or kept_children:
-        return TreeNode(
-            name=node.name,
-            path=node.path,
-            children=kept_children,
-            parameter=node.parameter if self_matches else None,
+@functools.lru_cache(maxsize=64)
+def _compile_glob(pattern: str) -> _Matcher:
+    """Compile *pattern* once into a matcher equivalent to ``fnmatch.fnmatch``.
+
+    Literal patterns, and literal prefixes ending in ``/*``, are matched with
+    plain string operations instead of a regex.  Matchers are cached per
+    pattern, so repeated filters with the same glob skip the translation.
+    """
+    if not _NORMCASE:
+        if _GLOB_CHARS.isdisjoint(pattern):
+            return pattern.__eq__
+        if pattern.endswith("/*") and _GLOB_CHARS.isdisjoint(pattern[:-1]):
+            prefix = pattern[:-1]
+            return lambda path: path.startswith(prefix)
+        return re.compile(fnmatch.translate(pattern)).match
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    return lambda path: match(os.path.normcase(path))
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the part of *pattern* before its first glob metacharacter.
+
+    Every path the pattern matches starts with this prefix.  Returns ``""``
+    where matching normalises case, since the prefix is then not exact.
+    """
+    if _NORMCASE:
+        return ""
+    for i, char in enumerate(pattern):
+        if char in _GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def _filter_node(node: TreeNode, match: _Matcher, literal: str = "") -> TreeNode | None:
+    """Filter the subtree rooted at *node*.  Returns None if nothing matches.
+
+    Walks the subtree iteratively in post-order, so deep namespaces cost no
+    Python recursion, and only builds nodes for subtrees that keep something.
+    Subtrees whose path diverges from *literal*, the pattern's literal prefix,
+    cannot contain a match and are skipped without being visited.
+    """
+    if literal and not _may_match(node.path, literal):
+        return None
+    # Each frame is [key in parent, node, pending children, kept children].
+    # The kept dict is created lazily, on the first child that survives.
+    stack: list[list[Any]] = [[node.name, node, iter(node.children.items()), None]]
+    result: TreeNode | None = None
+    while stack:
+        frame = stack[-1]
+        current: TreeNode = frame[1]
+        pending = next(frame[2], None)
+        if pending is not None:
+            name, child = pending
+            if literal and not _may_match(child.path, literal):
+                continue
+            stack.append([name, child, iter(child.children.items()), None])
+            continue
+
+        stack.pop()
+        kept: dict[str, TreeNode] | None = frame[3]
+        self_matches = current.parameter is not None and bool(match(current.path))
+        if not self_matches and not kept:
+            result = None
+            continue
+
+        result = TreeNode(
+            name=current.name,
+            path=current.path,
+            children=kept or {},
+            parameter=current.parameter if self_matches else None,
         )
-    return None
+        if stack:
+            parent = stack[-1]
+            if parent[3] is None:
+                parent[3] = {}
+            parent[3][frame[0]] = result
+    return result
+
+
+def _may_match(path: str, literal: str) -> bool:
+    """True if some path at or below *path* can start with *literal*."""
+    return path.startswith(literal) or literal.startswith(path + "/")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 from datetime import UTC, datetime
@@ -14,15 +15,7 @@ from moto import mock_aws
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
-@pytest.fixture(scope="session")
-def raw_parameters() -> list[dict]:
-    """Load raw parameter dicts from the JSON fixture file."""
-    with open(FIXTURES_DIR / "parameters.json") as fh:
-        return json.load(fh)
-
-
-@pytest.fixture()
-def aws_credentials():
+def pytest_configure(config):
     """Ensure moto doesn't try to use real AWS credentials."""
     os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
     os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
@@ -31,8 +24,56 @@ def aws_credentials():
     os.environ.setdefault("AWS_SESSION_TOKEN", "testing")
 
 
+@pytest.fixture(autouse=True)
+def _fresh_ssm_clients():
+    """Drop cached SSM clients so no client outlives the moto mock it was built under."""
+    from ssmtree.fetcher import make_client
+
+    make_client.cache_clear()
+    yield
+    make_client.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def _moto_module():
+    """Keep one moto mock active for a whole test module."""
+    with mock_aws():
+        yield
+
+
 @pytest.fixture()
-def ssm_client(aws_credentials):
+def moto_ssm(_moto_module):
+    """Run a test against the module's moto mock, wiping SSM state afterwards.
+
+    Entering ``mock_aws`` once per module rather than once per test avoids
+    re-patching botocore for every test; resetting the SSM backend keeps
+    tests isolated.
+    """
+    from moto.ssm.models import ssm_backends
+
+    yield
+    ssm_backends.reset()
+
+
+@pytest.fixture(scope="module")
+def moto_client(_moto_module):
+    """One boto3 SSM client per module, built under the module's moto mock.
+
+    Backend state is wiped by ``moto_ssm`` between tests, so the client itself
+    can be shared.
+    """
+    return boto3.client("ssm", region_name="us-east-1")
+
+
+@pytest.fixture(scope="session")
+def raw_parameters() -> list[dict]:
+    """Load raw parameter dicts from the JSON fixture file."""
+    with open(FIXTURES_DIR / "parameters.json") as fh:
+        return json.load(fh)
+
+
+@pytest.fixture()
+def ssm_client():
     """A moto-mocked SSM client with fixture parameters pre-loaded."""
     with mock_aws():
         client = boto3.client("ssm", region_name="us-east-1")
@@ -49,6 +90,22 @@ def ssm_client(aws_credentials):
         yield client
 
 
+@pytest.fixture(scope="session")
+def tree_factory():
+    """Return a memoized ``build_tree(params, root_path)`` for read-only tests.
+
+    Parameters are frozen and hashable, so identical inputs hand back the same
+    tree; callers must not mutate the result.
+    """
+    from ssmtree.tree import build_tree
+
+    @functools.cache
+    def build(params: tuple, root_path: str = "/"):
+        return build_tree(params, root_path=root_path)
+
+    return build
+
+
 @pytest.fixture()
 def prod_params():
     """Return Parameter objects for the /app/prod namespace."""
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import fields
 from datetime import UTC, datetime
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 import pytest
 from click.testing import CliRunner
@@ -14,125 +15,214 @@ from ssmtree.cli import main
 from ssmtree.models import Parameter
 from ssmtree.putter import PutError
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - orjson is the optional [fast] extra
+    from json import loads as _loads
 
+# Parameters are frozen, so one instance per distinct argument tuple (and one
+# shared timestamp) can safely be reused across tests.
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@functools.cache
 def _param(path: str, value: str = "val", type_: str = "String") -> Parameter:
-    segments = [s for s in path.split("/") if s]
     return Parameter(
         path=path,
-        name=segments[-1] if segments else path,
+        name=path.rpartition("/")[2] or path,
         value=value,
         type=type_,
         version=1,
-        last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+        last_modified=_FIXED_TS,
     )
 
 
-PROD_PARAMS = [
+PROD_PARAMS = (
     _param("/app/prod/db/host", "prod-host"),
     _param("/app/prod/db/port", "5432"),
     _param("/app/prod/db/password", "FAKE-test-password", "SecureString"),
-]
+)
 
-STAGING_PARAMS = [
+STAGING_PARAMS = (
     _param("/app/staging/db/host", "staging-host"),
     _param("/app/staging/db/port", "5432"),
-]
+)
+
+
+def _raw(params: list[Parameter]):
+    """Stand-in for fetch_parameters_raw: fresh dicts per call, as the real one yields."""
+    return lambda *args, **kwargs: iter(
+        [{f.name: getattr(p, f.name) for f in fields(p) if f.init} for p in params]
+    )
+
+
+class _Runner(CliRunner):
+    """CliRunner that names the program up front instead of inferring it per call."""
 
+    def invoke(self, cli, args=None, **kwargs):
+        kwargs.setdefault("prog_name", "ssmtree")
+        return super().invoke(cli, args, **kwargs)
 
-@pytest.fixture()
+    def invoke_ok(self, cli, args=None, **kwargs):
+        """Invoke a command that is expected to succeed.
+
+        Runs outside Click's standalone mode and lets exceptions propagate, so
+        an unexpected failure surfaces as its own traceback rather than as a
+        bare non-zero exit code.
+        """
+        result = self.invoke(cli, args, standalone_mode=False, catch_exceptions=False, **kwargs)
+        assert result.exception is None, result.output
+        return result
+
+
+@pytest.fixture(scope="session")
 def runner():
-    return CliRunner()
+    # CliRunner keeps no state between invocations, so one serves every test.
+    return _Runner()
+
+
+def _stub(monkeypatch, name: str) -> MagicMock:
+    mock = MagicMock()
+    monkeypatch.setattr(f"ssmtree.cli.{name}", mock)
+    return mock
+
+
+# Every AWS-facing name the CLI calls is stubbed for every test, so no test can
+# reach the network; tests configure the stubs they care about.
+@pytest.fixture(autouse=True)
+def mock_fetch(monkeypatch):
+    return _stub(monkeypatch, "fetch_parameters")
+
+
+@pytest.fixture(autouse=True)
+def mock_fetch_raw(monkeypatch):
+    return _stub(monkeypatch, "fetch_parameters_raw")
+
+
+@pytest.fixture(autouse=True)
+def mock_make(monkeypatch):
+    return _stub(monkeypatch, "make_client")
+
+
+@pytest.fixture(autouse=True)
+def mock_copy(monkeypatch):
+    return _stub(monkeypatch, "copy_namespace")
+
+
+@pytest.fixture(autouse=True)
+def mock_put(monkeypatch):
+    return _stub(monkeypatch, "put_parameter")
 
 
 class TestMainCommand:
     def test_help(self, runner):
-        result = runner.invoke(main, ["--help"])
-        assert result.exit_code == 0
+        result = runner.invoke_ok(main, ["--help"])
         assert "Usage:" in result.output
 
     def test_version(self, runner):
-        result = runner.invoke(main, ["--version"])
-        assert result.exit_code == 0
+        result = runner.invoke_ok(main, ["--version"])
         assert __version__ in result.output
 
-    def test_tree_output(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod"])
-        assert result.exit_code == 0
+    def test_import_does_not_load_boto3_or_rich(self):
+        """--help/--version startup must not pay for boto3 or rich."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, ssmtree.cli; "
+            "print(sorted(m for m in ('boto3', 'rich') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == "[]"
+
+    def test_tree_output(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["/app/prod"])
         assert "db" in result.output
 
-    def test_json_output(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--output", "json", "/app/prod"])
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+    def test_json_output(self, runner, mock_fetch_raw):
+        mock_fetch_raw.side_effect = _raw(PROD_PARAMS)
+        result = runner.invoke_ok(main, ["--output", "json", "/app/prod"])
+        data = _loads(result.output)
         assert isinstance(data, list)
         assert len(data) == 3
         paths = {item["path"] for item in data}
         assert "/app/prod/db/host" in paths
 
-    def test_json_output_redacts_secure_strings_by_default(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--output", "json", "/app/prod"])
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+    def test_json_output_redacts_secure_strings_by_default(self, runner, mock_fetch_raw):
+        mock_fetch_raw.side_effect = _raw(PROD_PARAMS)
+        result = runner.invoke_ok(main, ["--output", "json", "/app/prod"])
+        data = _loads(result.output)
         secure = [item for item in data if item["type"] == "SecureString"]
         assert len(secure) == 1
         assert secure[0]["value"] == "***REDACTED***"
 
-    def test_json_output_includes_secrets_when_flagged(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--output", "json", "--include-secrets", "/app/prod"])
-        assert result.exit_code == 0
+    def test_json_output_includes_secrets_when_flagged(self, runner, mock_fetch_raw):
+        mock_fetch_raw.side_effect = _raw(PROD_PARAMS)
+        result = runner.invoke_ok(main, ["--output", "json", "--include-secrets", "/app/prod"])
         assert "WARNING" in result.output
         # Extract JSON portion (after the warning line)
         json_start = result.output.index("[")
-        data = json.loads(result.output[json_start:])
+        data = _loads(result.output[json_start:])
         secure = [item for item in data if item["type"] == "SecureString"]
         assert len(secure) == 1
         assert secure[0]["value"] == "FAKE-test-password"
 
-    def test_values_shown_by_default(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod"])
-        assert result.exit_code == 0
+    def test_json_output_matches_without_orjson(self, runner, monkeypatch, mock_fetch_raw):
+        """The stdlib fallback must emit the same bytes as the orjson path."""
+        params = (*PROD_PARAMS, _param("/app/prod/greeting", "héllo — 日本 ✓\ttab"))
+        mock_fetch_raw.side_effect = _raw(params)
+        fast = runner.invoke_ok(main, ["--output", "json", "/app/prod"])
+        monkeypatch.setattr("ssmtree.cli._HAVE_ORJSON", False)
+        slow = runner.invoke_ok(main, ["--output", "json", "/app/prod"])
+        assert "日本".encode() in slow.stdout_bytes
+        assert fast.stdout_bytes == slow.stdout_bytes
+
+    def test_values_shown_by_default(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["/app/prod"])
         assert "prod-host" in result.output
 
-    def test_secure_string_redacted_by_default(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod"])
-        assert result.exit_code == 0
+    def test_secure_string_redacted_by_default(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["/app/prod"])
         assert "[redacted]" in result.output
         assert "FAKE-test-password" not in result.output
 
-    def test_show_values(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--show-values", "/app/prod"])
-        assert result.exit_code == 0
+    def test_show_values(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["--show-values", "/app/prod"])
         assert "prod-host" in result.output
 
-    def test_hide_values(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--hide-values", "/app/prod"])
-        assert result.exit_code == 0
+    def test_hide_values(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["--hide-values", "/app/prod"])
         assert "prod-host" not in result.output
 
-    def test_filter_option(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["--filter", "*/db/*", "/app/prod"])
-        assert result.exit_code == 0
+    def test_filter_option(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        runner.invoke_ok(main, ["--filter", "*/db/*", "/app/prod"])
 
-    def test_fetch_error_exits_nonzero(self, runner):
+    def test_fetch_error_exits_nonzero(self, runner, mock_fetch):
         from ssmtree.fetcher import FetchError
 
-        with patch("ssmtree.cli.fetch_parameters", side_effect=FetchError("denied")):
-            result = runner.invoke(main, ["/app/prod"])
+        mock_fetch.side_effect = FetchError("denied")
+        result = runner.invoke(main, ["/app/prod"])
         assert result.exit_code != 0
 
-    def test_default_path_is_root(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=[]) as mock_fetch:
-            result = runner.invoke(main, [])
-        assert result.exit_code == 0
+    def test_json_fetch_error_exits_nonzero(self, runner, mock_fetch_raw):
+        from ssmtree.fetcher import FetchError
+
+        mock_fetch_raw.side_effect = FetchError("denied")
+        result = runner.invoke(main, ["--output", "json", "/app/prod"])
+        assert result.exit_code != 0
+        assert "denied" in result.output
+
+    def test_default_path_is_root(self, runner, mock_fetch):
+        mock_fetch.return_value = []
+        runner.invoke_ok(main, [])
         mock_fetch.assert_called_once()
         call_args = mock_fetch.call_args
         assert call_args[0][0] == "/"
@@ -145,70 +235,89 @@ class TestMainCommand:
         result = runner.invoke(main, [" "])
         assert result.exit_code != 0
 
-    def test_decrypt_after_path_is_parsed(self, runner):
+    @pytest.mark.parametrize("path", ["/app//prod", "/app/prod/", "/app/pröd", "app"])
+    def test_path_validation_rejects_malformed(self, runner, path):
+        result = runner.invoke(main, [path])
+        assert result.exit_code != 0
+        assert "Invalid SSM path" in result.output
+
+    def test_decrypt_after_path_is_parsed(self, runner, mock_fetch):
         """--decrypt placed after PATH must be parsed, not silently ignored."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS) as mock_fetch:
-            result = runner.invoke(main, ["/app/prod", "--decrypt"])
-        assert result.exit_code == 0
+        mock_fetch.return_value = PROD_PARAMS
+        runner.invoke_ok(main, ["/app/prod", "--decrypt"])
         assert mock_fetch.call_args[1]["decrypt"] is True
 
-    def test_decrypt_after_path_reveals_secure_string(self, runner):
+    def test_decrypt_after_path_reveals_secure_string(self, runner, mock_fetch):
         """--decrypt after PATH should show the value, not [redacted]."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod", "--decrypt"])
-        assert result.exit_code == 0
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["/app/prod", "--decrypt"])
         assert "[redacted]" not in result.output
         assert "FAKE-test-password" in result.output
 
-    def test_hide_values_after_path_is_parsed(self, runner):
+    def test_hide_values_after_path_is_parsed(self, runner, mock_fetch):
         """--hide-values placed after PATH must be parsed."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod", "--hide-values"])
-        assert result.exit_code == 0
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(main, ["/app/prod", "--hide-values"])
         assert "prod-host" not in result.output
 
-    def test_filter_after_path_is_parsed(self, runner):
+    def test_filter_after_path_is_parsed(self, runner, mock_fetch):
         """--filter placed after PATH must be parsed."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(main, ["/app/prod", "--filter", "*/db/*"])
-        assert result.exit_code == 0
+        mock_fetch.return_value = PROD_PARAMS
+        runner.invoke_ok(main, ["/app/prod", "--filter", "*/db/*"])
+
+
+class TestJsonStreaming:
+    ROWS = [{"path": "/a", "value": "multi\nline", "version": 1}, {"path": "/b", "value": ""}]
+
+    @pytest.mark.parametrize("have_orjson", [True, False])
+    @pytest.mark.parametrize("rows", [ROWS, []])
+    def test_array_matches_whole_document_dump(self, monkeypatch, have_orjson, rows):
+        from ssmtree import cli
+
+        monkeypatch.setattr(cli, "_HAVE_ORJSON", have_orjson)
+        streamed = b"".join(cli._iter_json_array(iter(rows)))
+        assert streamed == cli._json_bytes(rows)
+
+    @pytest.mark.parametrize("have_orjson", [True, False])
+    def test_object_matches_whole_document_dump(self, monkeypatch, have_orjson):
+        from ssmtree import cli
+
+        monkeypatch.setattr(cli, "_HAVE_ORJSON", have_orjson)
+        sections = {"added": self.ROWS, "removed": [], "changed": self.ROWS[:1]}
+        streamed = b"".join(cli._iter_json_object({k: iter(v) for k, v in sections.items()}))
+        assert streamed == cli._json_bytes(sections)
 
 
 class TestDiffCommand:
     def test_diff_help(self, runner):
-        result = runner.invoke(main, ["diff", "--help"])
-        assert result.exit_code == 0
+        result = runner.invoke_ok(main, ["diff", "--help"])
         assert "PATH1" in result.output or "path1" in result.output.lower()
 
-    def test_diff_table_output(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", side_effect=[PROD_PARAMS, STAGING_PARAMS]):
-            result = runner.invoke(main, ["diff", "/app/prod", "/app/staging"])
-        assert result.exit_code == 0
+    def test_diff_table_output(self, runner, mock_fetch):
+        mock_fetch.side_effect = [PROD_PARAMS, STAGING_PARAMS]
+        runner.invoke_ok(main, ["diff", "/app/prod", "/app/staging"])
 
-    def test_diff_identical_shows_message(self, runner):
+    def test_diff_identical_shows_message(self, runner, mock_fetch):
         same = [_param("/prod/key", "val")]
         same2 = [_param("/staging/key", "val")]
-        with patch("ssmtree.cli.fetch_parameters", side_effect=[same, same2]):
-            result = runner.invoke(main, ["diff", "/prod", "/staging"])
-        assert result.exit_code == 0
+        mock_fetch.side_effect = [same, same2]
+        result = runner.invoke_ok(main, ["diff", "/prod", "/staging"])
         assert "identical" in result.output.lower()
 
-    def test_diff_json_output(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", side_effect=[PROD_PARAMS, STAGING_PARAMS]):
-            result = runner.invoke(main, ["diff", "--output", "json", "/app/prod", "/app/staging"])
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+    def test_diff_json_output(self, runner, mock_fetch):
+        mock_fetch.side_effect = [PROD_PARAMS, STAGING_PARAMS]
+        result = runner.invoke_ok(main, ["diff", "--output", "json", "/app/prod", "/app/staging"])
+        data = _loads(result.output)
         assert "added" in data
         assert "removed" in data
         assert "changed" in data
 
-    def test_diff_json_redacts_secure_strings_by_default(self, runner):
+    def test_diff_json_redacts_secure_strings_by_default(self, runner, mock_fetch):
         prod = [_param("/prod/secret", "top-secret", "SecureString")]
         staging = [_param("/staging/secret", "also-secret", "SecureString")]
-        with patch("ssmtree.cli.fetch_parameters", side_effect=[prod, staging]):
-            result = runner.invoke(main, ["diff", "--output", "json", "/prod", "/staging"])
-        assert result.exit_code == 0
-        data = json.loads(result.output)
+        mock_fetch.side_effect = [prod, staging]
+        result = runner.invoke_ok(main, ["diff", "--output", "json", "/prod", "/staging"])
+        data = _loads(result.output)
         for entry in data["changed"]:
             assert entry["old_value"] == "***REDACTED***"
             assert entry["new_value"] == "***REDACTED***"
@@ -220,132 +329,100 @@ class TestDiffCommand:
 
 class TestCopyCommand:
     def test_copy_help(self, runner):
-        result = runner.invoke(main, ["copy", "--help"])
-        assert result.exit_code == 0
-
-    def test_dry_run_shows_plan(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            result = runner.invoke(
-                main, ["copy", "--decrypt", "--dry-run", "/app/prod", "/app/staging"]
-            )
-        assert result.exit_code == 0
+        runner.invoke_ok(main, ["copy", "--help"])
+
+    def test_dry_run_shows_plan(self, runner, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke_ok(
+            main, ["copy", "--decrypt", "--dry-run", "/app/prod", "/app/staging"]
+        )
         assert "Dry run" in result.output or "dry" in result.output.lower()
 
-    def test_dry_run_does_not_call_make_client(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            with patch("ssmtree.cli.make_client") as mock_make:
-                result = runner.invoke(
-                    main, ["copy", "--decrypt", "--dry-run", "/app/prod", "/app/staging"]
-                )
-        assert result.exit_code == 0
+    def test_dry_run_does_not_call_make_client(self, runner, mock_fetch, mock_make):
+        mock_fetch.return_value = PROD_PARAMS
+        runner.invoke_ok(
+            main, ["copy", "--decrypt", "--dry-run", "/app/prod", "/app/staging"]
+        )
         mock_make.assert_not_called()
 
-    def test_copy_refuses_securestring_without_decrypt(self, runner):
+    def test_copy_refuses_securestring_without_decrypt(
+        self, runner, mock_copy, mock_fetch, mock_make
+    ):
         """Copying SecureStrings without --decrypt must abort, not corrupt secrets."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            with patch("ssmtree.cli.make_client") as mock_make:
-                with patch("ssmtree.cli.copy_namespace") as mock_copy:
-                    result = runner.invoke(main, ["copy", "--yes", "/app/prod", "/app/staging"])
+        mock_fetch.return_value = PROD_PARAMS
+        result = runner.invoke(main, ["copy", "--yes", "/app/prod", "/app/staging"])
         assert result.exit_code != 0
         assert "--decrypt" in result.output
         mock_make.assert_not_called()
         mock_copy.assert_not_called()
 
-    def test_copy_allows_non_secret_without_decrypt(self, runner):
+    def test_copy_allows_non_secret_without_decrypt(self, runner, mock_copy, mock_fetch):
         """A source with no SecureStrings copies fine without --decrypt."""
-        with patch("ssmtree.cli.fetch_parameters", return_value=STAGING_PARAMS):
-            with patch("ssmtree.cli.make_client"):
-                with patch(
-                    "ssmtree.cli.copy_namespace", return_value=(["/prod/a"], [])
-                ) as mock_copy:
-                    result = runner.invoke(main, ["copy", "--yes", "/app/staging", "/app/prod"])
-        assert result.exit_code == 0
+        mock_fetch.return_value = STAGING_PARAMS
+        mock_copy.return_value = (["/prod/a"], [])
+        runner.invoke_ok(main, ["copy", "--yes", "/app/staging", "/app/prod"])
         mock_copy.assert_called_once()
 
-    def test_empty_source_shows_message(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=[]):
-            result = runner.invoke(main, ["copy", "/app/prod", "/app/staging"])
-        assert result.exit_code == 0
+    def test_empty_source_shows_message(self, runner, mock_fetch):
+        mock_fetch.return_value = []
+        result = runner.invoke_ok(main, ["copy", "/app/prod", "/app/staging"])
         assert "No parameters" in result.output
 
-    def test_copy_invokes_copy_namespace(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            with patch("ssmtree.cli.make_client"):
-                with patch(
-                    "ssmtree.cli.copy_namespace",
-                    return_value=(["/staging/a"], []),
-                ) as mock_copy:
-                    result = runner.invoke(
-                        main, ["copy", "--decrypt", "--yes", "/app/prod", "/app/staging"]
-                    )
-        assert result.exit_code == 0
+    def test_copy_invokes_copy_namespace(self, runner, mock_copy, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        mock_copy.return_value = (["/staging/a"], [])
+        runner.invoke_ok(
+            main, ["copy", "--decrypt", "--yes", "/app/prod", "/app/staging"]
+        )
         mock_copy.assert_called_once()
 
-    def test_copy_without_yes_prompts(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            with patch("ssmtree.cli.make_client"):
-                with patch(
-                    "ssmtree.cli.copy_namespace",
-                    return_value=(["/staging/a"], []),
-                ):
-                    result = runner.invoke(
-                        main, ["copy", "--decrypt", "/app/prod", "/app/staging"], input="n\n"
-                    )
-        assert result.exit_code == 0
+    def test_copy_without_yes_prompts(self, runner, mock_copy, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        mock_copy.return_value = (["/staging/a"], [])
+        result = runner.invoke_ok(
+            main, ["copy", "--decrypt", "/app/prod", "/app/staging"], input="n\n"
+        )
         assert "Aborted" in result.output
 
     def test_copy_validates_paths(self, runner):
         result = runner.invoke(main, ["copy", "no-slash", "/staging"])
         assert result.exit_code != 0
 
-    def test_copy_reports_failures(self, runner):
-        with patch("ssmtree.cli.fetch_parameters", return_value=PROD_PARAMS):
-            with patch("ssmtree.cli.make_client"):
-                with patch(
-                    "ssmtree.cli.copy_namespace",
-                    return_value=(
-                        ["/staging/a"],
-                        [("/staging/b", "AccessDenied")],
-                    ),
-                ):
-                    result = runner.invoke(
-                        main, ["copy", "--decrypt", "--yes", "/app/prod", "/app/staging"]
-                    )
+    def test_copy_reports_failures(self, runner, mock_copy, mock_fetch):
+        mock_fetch.return_value = PROD_PARAMS
+        mock_copy.return_value = (["/staging/a"], [("/staging/b", "AccessDenied")])
+        result = runner.invoke(
+            main, ["copy", "--decrypt", "--yes", "/app/prod", "/app/staging"]
+        )
         # A partial copy failure must be reported AND surfaced as a nonzero exit.
         assert result.exit_code != 0
         assert "Failed 1" in result.output
+        assert "/staging/b: AccessDenied" in result.output
 
 
 class TestPutCommand:
     def test_put_help(self, runner):
-        result = runner.invoke(main, ["put", "--help"])
-        assert result.exit_code == 0
+        result = runner.invoke_ok(main, ["put", "--help"])
         assert "PATH" in result.output
 
-    def test_put_writes_and_shows_version(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=3) as mock_put:
-                result = runner.invoke(main, ["put", "/app/prod/db/host", "my-host"])
-        assert result.exit_code == 0
+    def test_put_writes_and_shows_version(self, runner, mock_put):
+        mock_put.return_value = 3
+        result = runner.invoke_ok(main, ["put", "/app/prod/db/host", "my-host"])
         assert "version 3" in result.output
         mock_put.assert_called_once()
 
-    def test_put_create_shows_created(self, runner):
+    def test_put_create_shows_created(self, runner, mock_put):
         """Success message says 'Created' for new parameters."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(main, ["put", "/app/prod/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(main, ["put", "/app/prod/key", "val"])
         assert "Created" in result.output
 
-    def test_put_overwrite_shows_updated(self, runner):
+    def test_put_overwrite_shows_updated(self, runner, mock_put):
         """Success message says 'Updated' when --overwrite is used."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=2):
-                result = runner.invoke(
-                    main, ["put", "--overwrite", "--yes", "/app/prod/key", "val"]
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 2
+        result = runner.invoke_ok(
+            main, ["put", "--overwrite", "--yes", "/app/prod/key", "val"]
+        )
         assert "Updated" in result.output
 
     def test_put_validates_path(self, runner):
@@ -358,12 +435,10 @@ class TestPutCommand:
         assert result.exit_code != 0
         assert "root" in result.output.lower()
 
-    def test_put_path_with_special_valid_chars(self, runner):
+    def test_put_path_with_special_valid_chars(self, runner, mock_put):
         """Paths with dots, underscores, and hyphens are valid."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(main, ["put", "/app/my-service_v2.0/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/app/my-service_v2.0/key", "val"])
 
     def test_put_path_with_invalid_chars_rejected(self, runner):
         """Paths with spaces or special characters are rejected."""
@@ -372,53 +447,45 @@ class TestPutCommand:
 
     # --- Value resolution ---
 
-    def test_put_stdin_reads_value(self, runner):
+    def test_put_stdin_reads_value(self, runner, mock_put):
         """--stdin reads the value from stdin."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--stdin", "/app/prod/db/password"],
-                    input="mysecret\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--stdin", "/app/prod/db/password"],
+            input="mysecret\n",
+        )
         assert mock_put.call_args[1]["value"] == "mysecret"
 
-    def test_put_stdin_strips_exactly_one_trailing_newline(self, runner):
+    def test_put_stdin_strips_exactly_one_trailing_newline(self, runner, mock_put):
         """Only one trailing newline is stripped (echo adds one)."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--stdin", "/app/prod/key"],
-                    input="value\n\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--stdin", "/app/prod/key"],
+            input="value\n\n",
+        )
         # The second \n should be preserved as part of the value.
         assert mock_put.call_args[1]["value"] == "value\n"
 
-    def test_put_stdin_no_trailing_newline(self, runner):
+    def test_put_stdin_no_trailing_newline(self, runner, mock_put):
         """Input without a trailing newline is used as-is."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--stdin", "/app/prod/key"],
-                    input="value-no-newline",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--stdin", "/app/prod/key"],
+            input="value-no-newline",
+        )
         assert mock_put.call_args[1]["value"] == "value-no-newline"
 
-    def test_put_stdin_multiline_value(self, runner):
+    def test_put_stdin_multiline_value(self, runner, mock_put):
         """Multiline values from stdin are preserved (minus one trailing newline)."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--stdin", "/app/prod/key"],
-                    input="line1\nline2\nline3\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--stdin", "/app/prod/key"],
+            input="line1\nline2\nline3\n",
+        )
         assert mock_put.call_args[1]["value"] == "line1\nline2\nline3"
 
     def test_put_stdin_and_positional_value_conflict(self, runner):
@@ -457,85 +524,71 @@ class TestPutCommand:
         assert result.exit_code != 0
         assert "Missing" in result.output or "VALUE" in result.output
 
-    def test_put_whitespace_only_value_is_accepted(self, runner):
+    def test_put_whitespace_only_value_is_accepted(self, runner, mock_put):
         """A value of only whitespace is technically valid for SSM."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(main, ["put", "/app/prod/key", "   "])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/app/prod/key", "   "])
         assert mock_put.call_args[1]["value"] == "   "
 
     # --- SecureString warnings ---
 
-    def test_put_secure_positional_warns(self, runner):
+    def test_put_secure_positional_warns(self, runner, mock_put):
         """Passing a SecureString value as a CLI arg emits a warning."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--secure", "/app/prod/secret", "visible-secret"],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--secure", "/app/prod/secret", "visible-secret"],
+        )
         assert "WARNING" in result.output
         assert "shell history" in result.output or "process list" in result.output
 
-    def test_put_secure_stdin_no_warning(self, runner):
+    def test_put_secure_stdin_no_warning(self, runner, mock_put):
         """--stdin with --secure should NOT emit process list warning."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--secure", "--stdin", "/app/prod/secret"],
-                    input="safe-secret\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--secure", "--stdin", "/app/prod/secret"],
+            input="safe-secret\n",
+        )
         assert "process list" not in result.output
 
     # --- Overwrite confirmation ---
 
-    def test_put_overwrite_prompts_without_yes(self, runner):
+    def test_put_overwrite_prompts_without_yes(self, runner, mock_put):
         """--overwrite without --yes prompts for confirmation."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--overwrite", "/app/prod/key", "val"],
-                    input="n\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--overwrite", "/app/prod/key", "val"],
+            input="n\n",
+        )
         assert "Aborted" in result.output
 
-    def test_put_overwrite_declined_does_not_call_put(self, runner):
+    def test_put_overwrite_declined_does_not_call_put(self, runner, mock_put):
         """--overwrite declined via prompt must NOT call put_parameter."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--overwrite", "/app/prod/key", "val"],
-                    input="n\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--overwrite", "/app/prod/key", "val"],
+            input="n\n",
+        )
         mock_put.assert_not_called()
 
-    def test_put_overwrite_confirmed_proceeds(self, runner):
+    def test_put_overwrite_confirmed_proceeds(self, runner, mock_put):
         """--overwrite confirmed via prompt proceeds."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=2) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--overwrite", "/app/prod/key", "val"],
-                    input="y\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 2
+        runner.invoke_ok(
+            main,
+            ["put", "--overwrite", "/app/prod/key", "val"],
+            input="y\n",
+        )
         mock_put.assert_called_once()
 
-    def test_put_overwrite_yes_skips_prompt(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=2) as mock_put:
-                result = runner.invoke(
-                    main, ["put", "--overwrite", "--yes", "/app/prod/key", "val"]
-                )
-        assert result.exit_code == 0
+    def test_put_overwrite_yes_skips_prompt(self, runner, mock_put):
+        mock_put.return_value = 2
+        runner.invoke_ok(
+            main, ["put", "--overwrite", "--yes", "/app/prod/key", "val"]
+        )
         mock_put.assert_called_once()
 
     def test_put_overwrite_stdin_without_yes_fails(self, runner):
@@ -548,72 +601,60 @@ class TestPutCommand:
         assert result.exit_code != 0
         assert "--yes" in result.output
 
-    def test_put_overwrite_stdin_with_yes_succeeds(self, runner):
+    def test_put_overwrite_stdin_with_yes_succeeds(self, runner, mock_put):
         """--overwrite with --stdin and --yes should work."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=2) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--overwrite", "--yes", "--stdin", "/app/prod/key"],
-                    input="new-value\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 2
+        runner.invoke_ok(
+            main,
+            ["put", "--overwrite", "--yes", "--stdin", "/app/prod/key"],
+            input="new-value\n",
+        )
         mock_put.assert_called_once()
         assert mock_put.call_args[1]["value"] == "new-value"
 
-    def test_put_no_overwrite_no_prompt(self, runner):
+    def test_put_no_overwrite_no_prompt(self, runner, mock_put):
         """Without --overwrite, no confirmation prompt is shown."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(main, ["put", "/app/prod/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(main, ["put", "/app/prod/key", "val"])
         mock_put.assert_called_once()
         assert "Overwrite" not in result.output
 
     # --- Type options ---
 
-    def test_put_default_type_is_string(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                runner.invoke(main, ["put", "/app/prod/key", "val"])
+    def test_put_default_type_is_string(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke(main, ["put", "/app/prod/key", "val"])
         assert mock_put.call_args[1]["param_type"] == "String"
 
-    def test_put_type_secure_string(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                runner.invoke(
-                    main, ["put", "--type", "SecureString", "/app/prod/secret", "val"]
-                )
+    def test_put_type_secure_string(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke(
+            main, ["put", "--type", "SecureString", "/app/prod/secret", "val"]
+        )
         assert mock_put.call_args[1]["param_type"] == "SecureString"
 
-    def test_put_type_string_list(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--type", "StringList", "/app/prod/ips", "10.0.0.1,10.0.0.2"],
-                )
-        assert result.exit_code == 0
+    def test_put_type_string_list(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--type", "StringList", "/app/prod/ips", "10.0.0.1,10.0.0.2"],
+        )
         assert mock_put.call_args[1]["param_type"] == "StringList"
 
-    def test_put_secure_flag(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main, ["put", "--secure", "--stdin", "/app/prod/secret"], input="s3cret\n"
-                )
-        assert result.exit_code == 0
+    def test_put_secure_flag(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main, ["put", "--secure", "--stdin", "/app/prod/secret"], input="s3cret\n"
+        )
         assert mock_put.call_args[1]["param_type"] == "SecureString"
 
-    def test_secure_flag_overrides_type_option(self, runner):
+    def test_secure_flag_overrides_type_option(self, runner, mock_put):
         """--secure should override --type String to SecureString."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--type", "String", "--secure", "/app/prod/key", "val"],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--type", "String", "--secure", "/app/prod/key", "val"],
+        )
         assert mock_put.call_args[1]["param_type"] == "SecureString"
 
     def test_put_kms_key_id_without_secure_string_fails(self, runner):
@@ -626,163 +667,135 @@ class TestPutCommand:
 
     # --- Optional parameters ---
 
-    def test_put_with_kms_key_id(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                runner.invoke(
-                    main,
-                    [
-                        "put", "--type", "SecureString",
-                        "--kms-key-id", "alias/my-key",
-                        "/app/prod/secret", "val",
-                    ],
-                )
+    def test_put_with_kms_key_id(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke(
+            main,
+            [
+                "put", "--type", "SecureString",
+                "--kms-key-id", "alias/my-key",
+                "/app/prod/secret", "val",
+            ],
+        )
         assert mock_put.call_args[1]["kms_key_id"] == "alias/my-key"
 
-    def test_put_with_description(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                runner.invoke(
-                    main,
-                    ["put", "--description", "My param", "/app/prod/key", "val"],
-                )
+    def test_put_with_description(self, runner, mock_put):
+        mock_put.return_value = 1
+        runner.invoke(
+            main,
+            ["put", "--description", "My param", "/app/prod/key", "val"],
+        )
         assert mock_put.call_args[1]["description"] == "My param"
 
-    def test_put_description_none_by_default(self, runner):
+    def test_put_description_none_by_default(self, runner, mock_put):
         """When --description is not provided, None is passed."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(main, ["put", "/app/prod/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/app/prod/key", "val"])
         assert mock_put.call_args[1]["description"] is None
 
     # --- Error handling ---
 
-    def test_put_error_exits_nonzero(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", side_effect=PutError("access denied")):
-                result = runner.invoke(main, ["put", "/app/prod/db/host", "my-host"])
+    def test_put_error_exits_nonzero(self, runner, mock_put):
+        mock_put.side_effect = PutError("access denied")
+        result = runner.invoke(main, ["put", "/app/prod/db/host", "my-host"])
         assert result.exit_code != 0
         assert "access denied" in result.output
 
-    def test_put_already_exists_message(self, runner):
-        with patch("ssmtree.cli.make_client"):
-            with patch(
-                "ssmtree.cli.put_parameter",
-                side_effect=PutError(
-                    "Parameter '/app/prod/db/host' already exists. Use --overwrite to replace it."
-                ),
-            ):
-                result = runner.invoke(main, ["put", "/app/prod/db/host", "my-host"])
+    def test_put_already_exists_message(self, runner, mock_put):
+        mock_put.side_effect = PutError(
+            "Parameter '/app/prod/db/host' already exists. Use --overwrite to replace it."
+        )
+        result = runner.invoke(main, ["put", "/app/prod/db/host", "my-host"])
         assert result.exit_code != 0
         assert "already exists" in result.output
 
     # --- Client / connection ---
 
-    def test_put_uses_make_client(self, runner):
+    def test_put_uses_make_client(self, runner, mock_make, mock_put):
         """put command uses the shared retry-configured client factory."""
-        with patch("ssmtree.cli.make_client") as mock_make:
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(main, ["put", "/app/prod/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/app/prod/key", "val"])
         mock_make.assert_called_once()
 
-    def test_put_forwards_profile_and_region(self, runner):
+    def test_put_forwards_profile_and_region(self, runner, mock_make, mock_put):
         """--profile, --region and --endpoint-url are forwarded to make_client."""
-        with patch("ssmtree.cli.make_client") as mock_make:
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--profile", "myprofile", "--region", "eu-west-1",
-                     "--endpoint-url", "http://localhost:4566",
-                     "/app/prod/key", "val"],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            ["put", "--profile", "myprofile", "--region", "eu-west-1",
+             "--endpoint-url", "http://localhost:4566",
+             "/app/prod/key", "val"],
+        )
         mock_make.assert_called_once_with("myprofile", "eu-west-1", "http://localhost:4566")
 
-    def test_put_bad_client_aborts_cleanly(self, runner):
+    def test_put_bad_client_aborts_cleanly(self, runner, mock_make):
         """A client-creation failure (bad profile/region) aborts cleanly, no traceback."""
         from ssmtree.errors import ClientCreationError
 
-        with patch(
-            "ssmtree.cli.make_client",
-            side_effect=ClientCreationError("could not resolve region"),
-        ):
-            result = runner.invoke(main, ["put", "/app/prod/key", "val"])
+        mock_make.side_effect = ClientCreationError("could not resolve region")
+        result = runner.invoke(main, ["put", "/app/prod/key", "val"])
         assert result.exit_code == 1
         assert "Error:" in result.output
         assert not isinstance(result.exception, ClientCreationError)
 
     # --- Full integration ---
 
-    def test_put_secure_stdin_full_path(self, runner):
+    def test_put_secure_stdin_full_path(self, runner, mock_put):
         """Full integration: --secure --stdin reads value and sets SecureString."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--secure", "--stdin", "/app/prod/secret"],
-                    input="my-secret\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--secure", "--stdin", "/app/prod/secret"],
+            input="my-secret\n",
+        )
         assert mock_put.call_args[1]["param_type"] == "SecureString"
         assert mock_put.call_args[1]["value"] == "my-secret"
         assert "SecureString" in result.output
 
     # --- Additional edge-case tests ---
 
-    def test_put_no_overwrite_explicit_flag_behaves_like_default(self, runner):
+    def test_put_no_overwrite_explicit_flag_behaves_like_default(self, runner, mock_put):
         """Explicit --no-overwrite behaves identically to the default (no prompt)."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main, ["put", "--no-overwrite", "/app/prod/key", "val"]
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main, ["put", "--no-overwrite", "/app/prod/key", "val"]
+        )
         mock_put.assert_called_once()
         assert mock_put.call_args[1]["overwrite"] is False
 
-    def test_put_empty_description_string_is_forwarded(self, runner):
+    def test_put_empty_description_string_is_forwarded(self, runner, mock_put):
         """--description '' should forward an empty string, not None."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main, ["put", "--description", "", "/app/prod/key", "val"]
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main, ["put", "--description", "", "/app/prod/key", "val"]
+        )
         assert mock_put.call_args[1]["description"] == ""
 
-    def test_put_string_type_label_in_output(self, runner):
+    def test_put_string_type_label_in_output(self, runner, mock_put):
         """Success output includes the parameter type for String."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main, ["put", "--type", "String", "/app/prod/key", "val"]
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main, ["put", "--type", "String", "/app/prod/key", "val"]
+        )
         assert "String" in result.output
 
-    def test_put_string_list_type_label_in_output(self, runner):
+    def test_put_string_list_type_label_in_output(self, runner, mock_put):
         """Success output includes the parameter type for StringList."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--type", "StringList", "/app/prod/ips", "10.0.0.1,10.0.0.2"],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--type", "StringList", "/app/prod/ips", "10.0.0.1,10.0.0.2"],
+        )
         assert "StringList" in result.output
 
-    def test_put_secure_string_type_label_in_output(self, runner):
+    def test_put_secure_string_type_label_in_output(self, runner, mock_put):
         """Success output shows 'SecureString' for SecureString parameters."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(
-                    main,
-                    ["put", "--stdin", "--secure", "/app/prod/secret"],
-                    input="s3cret\n",
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        result = runner.invoke_ok(
+            main,
+            ["put", "--stdin", "--secure", "/app/prod/secret"],
+            input="s3cret\n",
+        )
         assert "SecureString" in result.output
 
     def test_put_path_with_consecutive_slashes_rejected_by_cli(self, runner):
@@ -805,67 +818,57 @@ class TestPutCommand:
         result = runner.invoke(main, ["put", "///key", "val"])
         assert result.exit_code != 0
 
-    def test_put_path_single_segment_still_valid(self, runner):
+    def test_put_path_single_segment_still_valid(self, runner, mock_put):
         """A single-segment path like /key is still valid."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(main, ["put", "/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/key", "val"])
 
-    def test_put_kms_key_id_only_forwarded_for_secure_string(self, runner):
+    def test_put_kms_key_id_only_forwarded_for_secure_string(self, runner, mock_put):
         """--kms-key-id with String type is rejected before calling put_parameter."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter") as mock_put:
-                result = runner.invoke(
-                    main,
-                    ["put", "--type", "String", "--kms-key-id", "alias/key",
-                     "/app/prod/key", "val"],
-                )
+        result = runner.invoke(
+            main,
+            ["put", "--type", "String", "--kms-key-id", "alias/key",
+             "/app/prod/key", "val"],
+        )
         assert result.exit_code != 0
         mock_put.assert_not_called()
 
-    def test_put_string_list_value_with_commas_forwarded_verbatim(self, runner):
+    def test_put_string_list_value_with_commas_forwarded_verbatim(self, runner, mock_put):
         """StringList values are forwarded as-is (comma-separation is AWS's concern)."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    [
-                        "put",
-                        "--type",
-                        "StringList",
-                        "/app/prod/ips",
-                        "10.0.0.1,10.0.0.2,10.0.0.3",
-                    ],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            [
+                "put",
+                "--type",
+                "StringList",
+                "/app/prod/ips",
+                "10.0.0.1,10.0.0.2,10.0.0.3",
+            ],
+        )
         assert mock_put.call_args[1]["value"] == "10.0.0.1,10.0.0.2,10.0.0.3"
 
-    def test_put_secure_with_kms_key_id_forwarded(self, runner):
+    def test_put_secure_with_kms_key_id_forwarded(self, runner, mock_put):
         """--secure combined with --kms-key-id forwards the key to put_parameter."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1) as mock_put:
-                result = runner.invoke(
-                    main,
-                    [
-                        "put",
-                        "--secure",
-                        "--kms-key-id",
-                        "arn:aws:kms:us-east-1:111122223333:key/my-key",
-                        "/app/prod/secret",
-                        "s3cret",
-                    ],
-                )
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(
+            main,
+            [
+                "put",
+                "--secure",
+                "--kms-key-id",
+                "arn:aws:kms:us-east-1:111122223333:key/my-key",
+                "/app/prod/secret",
+                "s3cret",
+            ],
+        )
         assert (
             mock_put.call_args[1]["kms_key_id"]
             == "arn:aws:kms:us-east-1:111122223333:key/my-key"
         )
         assert mock_put.call_args[1]["param_type"] == "SecureString"
 
-    def test_put_single_level_path_accepted(self, runner):
+    def test_put_single_level_path_accepted(self, runner, mock_put):
         """Path with a single level (e.g. '/key') is valid."""
-        with patch("ssmtree.cli.make_client"):
-            with patch("ssmtree.cli.put_parameter", return_value=1):
-                result = runner.invoke(main, ["put", "/key", "val"])
-        assert result.exit_code == 0
+        mock_put.return_value = 1
+        runner.invoke_ok(main, ["put", "/key", "val"])
@@ -2,153 +2,165 @@
 
 from __future__ import annotations
 
-import os
+import functools
 from datetime import UTC, datetime
 
-import boto3
 import pytest
-from moto import mock_aws
+from moto.core import DEFAULT_ACCOUNT_ID
+from moto.ssm.models import ssm_backends
 
-from ssmtree.copier import _rewrite_path, copy_namespace
+from ssmtree.copier import _path_rewriter, copy_namespace
 from ssmtree.models import Parameter
 
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
 
+pytestmark = [
+    pytest.mark.usefixtures("moto_ssm"),
+    pytest.mark.moto,
+    pytest.mark.xdist_group("moto"),
+]
+
+
+@functools.cache
 def _param(path: str, value: str = "v", type_: str = "String") -> Parameter:
-    segments = [s for s in path.split("/") if s]
     return Parameter(
         path=path,
-        name=segments[-1] if segments else path,
+        name=path.rpartition("/")[2] or path,
         value=value,
         type=type_,
         version=1,
-        last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+        last_modified=_FIXED_TS,
     )
 
 
-@pytest.fixture(autouse=True)
-def aws_env():
-    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
-    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
-    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
-    os.environ.setdefault("AWS_SECURITY_TOKEN", "testing")
-    os.environ.setdefault("AWS_SESSION_TOKEN", "testing")
+def _moto_ssm(region: str = "us-east-1"):
+    """Return moto's in-memory SSM backend, for checking writes without an API round trip."""
+    return ssm_backends[DEFAULT_ACCOUNT_ID][region]
 
 
-class TestRewritePath:
-    def test_rewrite_simple(self):
-        assert _rewrite_path("/prod/db/host", "/prod", "/staging") == "/staging/db/host"
+def _moto_ssm_names(region: str = "us-east-1") -> set[str]:
+    return set(_moto_ssm(region)._parameters)
 
-    def test_rewrite_deep(self):
-        assert (
-            _rewrite_path("/a/b/c/d", "/a/b", "/x/y") == "/x/y/c/d"
-        )
 
-    def test_rewrite_exact_match(self):
-        assert _rewrite_path("/prod", "/prod", "/staging") == "/staging"
-
-    def test_rewrite_no_match_unchanged(self):
-        assert _rewrite_path("/other/key", "/prod", "/staging") == "/other/key"
-
-    def test_rewrite_strips_trailing_slash(self):
-        assert _rewrite_path("/prod/key", "/prod/", "/staging/") == "/staging/key"
+class TestRewritePath:
+    @pytest.mark.parametrize(
+        ("path", "source", "dest", "expected"),
+        [
+            ("/prod/db/host", "/prod", "/staging", "/staging/db/host"),
+            ("/a/b/c/d", "/a/b", "/x/y", "/x/y/c/d"),
+            ("/prod", "/prod", "/staging", "/staging"),
+            ("/other/key", "/prod", "/staging", "/other/key"),
+            ("/prod/key", "/prod/", "/staging/", "/staging/key"),
+        ],
+        ids=["simple", "deep", "exact-match", "no-match-unchanged", "strips-trailing-slash"],
+    )
+    def test_rewrite(self, path, source, dest, expected):
+        assert _path_rewriter(source, dest)(path) == expected
 
 
 class TestCopyNamespace:
-    @mock_aws
-    def test_dry_run_returns_planned_paths(self):
-        client = boto3.client("ssm", region_name="us-east-1")
+    def test_dry_run_returns_planned_paths(self, moto_client):
         params = [
             _param("/prod/db/host", "host"),
             _param("/prod/db/port", "5432"),
         ]
         written, failed = copy_namespace(
-            params, "/prod", "/staging", client, dry_run=True
+            params, "/prod", "/staging", moto_client, dry_run=True
         )
         assert "/staging/db/host" in written
         assert "/staging/db/port" in written
         assert len(written) == 2
         assert failed == []
 
-    @mock_aws
-    def test_dry_run_does_not_write(self):
-        client = boto3.client("ssm", region_name="us-east-1")
+    def test_dry_run_does_not_write(self, moto_client):
         params = [_param("/prod/key", "val")]
 
-        copy_namespace(params, "/prod", "/staging", client, dry_run=True)
+        copy_namespace(params, "/prod", "/staging", moto_client, dry_run=True)
 
         # Nothing should have been written
-        response = client.get_parameters_by_path(Path="/staging", Recursive=True)
-        assert response["Parameters"] == []
+        assert _moto_ssm_names() == set()
 
-    @mock_aws
-    def test_copy_writes_params(self):
-        client = boto3.client("ssm", region_name="us-east-1")
+    def test_copy_writes_params(self, moto_client):
+        """One copy checks names, values, types and the returned paths together."""
         params = [
             _param("/prod/db/host", "prod-host"),
             _param("/prod/db/port", "5432"),
+            _param("/prod/ips", "10.0.0.1,10.0.0.2", type_="StringList"),
         ]
 
-        written, failed = copy_namespace(params, "/prod", "/staging", client)
+        written, failed = copy_namespace(params, "/prod", "/staging", moto_client)
 
-        assert len(written) == 2
         assert failed == []
-        response = client.get_parameters_by_path(Path="/staging", Recursive=True)
-        dest_names = {p["Name"] for p in response["Parameters"]}
-        assert "/staging/db/host" in dest_names
-        assert "/staging/db/port" in dest_names
+        assert written == ["/staging/db/host", "/staging/db/port", "/staging/ips"]
+        assert _moto_ssm_names() == set(written)
+        backend = _moto_ssm()
+        stored = {name: backend.get_parameter(name) for name in written}
+        assert {name: p.value for name, p in stored.items()} == {
+            "/staging/db/host": "prod-host",
+            "/staging/db/port": "5432",
+            "/staging/ips": "10.0.0.1,10.0.0.2",
+        }
+        assert stored["/staging/db/host"].parameter_type == "String"
+        assert stored["/staging/ips"].parameter_type == "StringList"
+
+    def test_copy_overwrite_flag(self, moto_client):
+        # Pre-seed destination
+        moto_client.put_parameter(Name="/staging/key", Value="old", Type="String")
 
-    @mock_aws
-    def test_copy_preserves_values(self):
-        client = boto3.client("ssm", region_name="us-east-1")
-        params = [_param("/prod/key", "my-special-value")]
+        params = [_param("/prod/key", "new")]
+        # Should not raise even though param exists, because overwrite=True
+        written, failed = copy_namespace(params, "/prod", "/staging", moto_client, overwrite=True)
 
-        written, failed = copy_namespace(params, "/prod", "/staging", client)
+        assert failed == []
+        assert _moto_ssm().get_parameter("/staging/key").value == "new"
 
+    def test_empty_source_returns_empty(self, moto_client):
+        written, failed = copy_namespace([], "/prod", "/staging", moto_client)
+        assert written == []
         assert failed == []
-        response = client.get_parameter(Name="/staging/key")
-        assert response["Parameter"]["Value"] == "my-special-value"
 
-    @mock_aws
-    def test_copy_preserves_type(self):
-        client = boto3.client("ssm", region_name="us-east-1")
-        params = [_param("/prod/key", "v", type_="StringList")]
+    def test_copy_reports_results_in_path_order(self):
+        """Concurrent writes must not scramble the written/failed ordering."""
+        from botocore.exceptions import ClientError
 
-        written, failed = copy_namespace(params, "/prod", "/staging", client)
+        class PartlyFailingClient:
+            def put_parameter(self, **kwargs):
+                if kwargs["Name"].endswith("7"):
+                    raise ClientError(
+                        {"Error": {"Code": "ValidationException", "Message": "bad"}},
+                        "PutParameter",
+                    )
+                return {"Version": 1}
 
-        assert failed == []
-        response = client.get_parameter(Name="/staging/key")
-        assert response["Parameter"]["Type"] == "StringList"
+        params = [_param(f"/prod/k{i:02d}") for i in range(20)]
+        written, failed = copy_namespace(params, "/prod", "/staging", PartlyFailingClient())
 
-    @mock_aws
-    def test_copy_returns_written_paths(self):
-        client = boto3.client("ssm", region_name="us-east-1")
-        params = [_param("/prod/a"), _param("/prod/b")]
+        assert written == [f"/staging/k{i:02d}" for i in range(20) if i % 10 != 7]
+        assert failed == [("/staging/k07", "bad"), ("/staging/k17", "bad")]
 
-        written, failed = copy_namespace(params, "/prod", "/staging", client)
+    def test_interrupted_copy_stops_queued_writes(self, monkeypatch):
+        """An interrupt mid-copy must not leave the remaining writes running."""
+        from rich.progress import Progress
 
-        assert set(written) == {"/staging/a", "/staging/b"}
-        assert failed == []
+        from ssmtree._pool import pool_size
 
-    @mock_aws
-    def test_copy_overwrite_flag(self):
-        client = boto3.client("ssm", region_name="us-east-1")
-        # Pre-seed destination
-        client.put_parameter(Name="/staging/key", Value="old", Type="String")
+        puts = []
 
-        params = [_param("/prod/key", "new")]
-        # Should not raise even though param exists, because overwrite=True
-        written, failed = copy_namespace(params, "/prod", "/staging", client, overwrite=True)
+        class RecordingClient:
+            def put_parameter(self, **kwargs):
+                puts.append(kwargs["Name"])
+                return {"Version": 1}
 
-        assert failed == []
-        response = client.get_parameter(Name="/staging/key")
-        assert response["Parameter"]["Value"] == "new"
+        def interrupt(self, task_id, advance=1):
+            raise KeyboardInterrupt
 
-    @mock_aws
-    def test_empty_source_returns_empty(self):
-        client = boto3.client("ssm", region_name="us-east-1")
-        written, failed = copy_namespace([], "/prod", "/staging", client)
-        assert written == []
-        assert failed == []
+        monkeypatch.setattr(Progress, "advance", interrupt)
+        params = [_param(f"/prod/k{i:03d}") for i in range(200)]
+
+        with pytest.raises(KeyboardInterrupt):
+            copy_namespace(params, "/prod", "/staging", RecordingClient())
+
+        assert len(puts) <= pool_size()
 
     def test_copy_error_message_is_sanitized(self):
         """ClientError messages must have ARNs, account IDs, and values scrubbed."""
@@ -2,96 +2,73 @@
 
 from __future__ import annotations
 
+import functools
 from datetime import UTC, datetime
 
+import pytest
+
 from ssmtree.differ import diff_namespaces
 from ssmtree.models import Parameter
 
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+
 
+@functools.cache
 def _param(path: str, value: str = "v", prefix: str = "/prod") -> Parameter:
-    segments = [s for s in path.split("/") if s]
     return Parameter(
         path=path,
-        name=segments[-1] if segments else path,
+        name=path.rpartition("/")[2] or path,
         value=value,
         type="String",
         version=1,
-        last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+        last_modified=_FIXED_TS,
     )
 
 
 class TestDiffNamespaces:
-    def test_identical_namespaces_no_diff(self):
-        p1 = [_param("/prod/db/host", "val")]
-        p2 = [_param("/staging/db/host", "val")]
-        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
-        assert added == []
-        assert removed == []
-        assert changed == []
-
-    def test_added_param(self):
-        p1 = [_param("/prod/db/host", "val")]
-        p2 = [
-            _param("/staging/db/host", "val"),
-            _param("/staging/db/port", "5432"),
-        ]
-        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
-        assert len(added) == 1
-        assert added[0].path == "/staging/db/port"
-        assert removed == []
-        assert changed == []
-
-    def test_removed_param(self):
-        p1 = [
-            _param("/prod/db/host", "val"),
-            _param("/prod/db/port", "5432"),
-        ]
-        p2 = [_param("/staging/db/host", "val")]
-        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
-        assert added == []
-        assert len(removed) == 1
-        assert removed[0].path == "/prod/db/port"
-        assert changed == []
-
-    def test_changed_param(self):
-        p1 = [_param("/prod/db/host", "prod-host")]
-        p2 = [_param("/staging/db/host", "staging-host")]
-        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
-        assert added == []
-        assert removed == []
-        assert len(changed) == 1
-        old, new = changed[0]
-        assert old.value == "prod-host"
-        assert new.value == "staging-host"
-
-    def test_mixed_diff(self):
-        p1 = [
-            _param("/prod/a", "same"),
-            _param("/prod/b", "old"),
-            _param("/prod/c", "only-in-prod"),
-        ]
-        p2 = [
-            _param("/staging/a", "same"),
-            _param("/staging/b", "new"),
-            _param("/staging/d", "only-in-staging"),
-        ]
-        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
-
-        added_paths = {p.path for p in added}
-        removed_paths = {p.path for p in removed}
-
-        assert "/staging/d" in added_paths
-        assert "/prod/c" in removed_paths
-        assert len(changed) == 1
-        old, new = changed[0]
-        assert old.path == "/prod/b"
-        assert new.value == "new"
-
-    def test_empty_both_sides(self):
-        added, removed, changed = diff_namespaces([], [], "/prod", "/staging")
-        assert added == []
-        assert removed == []
-        assert changed == []
+    @pytest.mark.parametrize(
+        ("p1", "p2", "added", "removed", "changed"),
+        [
+            ([("/prod/db/host", "val")], [("/staging/db/host", "val")], [], [], []),
+            (
+                [("/prod/db/host", "val")],
+                [("/staging/db/host", "val"), ("/staging/db/port", "5432")],
+                ["/staging/db/port"],
+                [],
+                [],
+            ),
+            (
+                [("/prod/db/host", "val"), ("/prod/db/port", "5432")],
+                [("/staging/db/host", "val")],
+                [],
+                ["/prod/db/port"],
+                [],
+            ),
+            (
+                [("/prod/db/host", "prod-host")],
+                [("/staging/db/host", "staging-host")],
+                [],
+                [],
+                [("/prod/db/host", "/staging/db/host")],
+            ),
+            (
+                [("/prod/a", "same"), ("/prod/b", "old"), ("/prod/c", "only-in-prod")],
+                [("/staging/a", "same"), ("/staging/b", "new"), ("/staging/d", "only-in-staging")],
+                ["/staging/d"],
+                ["/prod/c"],
+                [("/prod/b", "/staging/b")],
+            ),
+            ([], [], [], [], []),
+        ],
+        ids=["identical", "added", "removed", "changed", "mixed", "empty"],
+    )
+    def test_diff_shape(self, p1, p2, added, removed, changed):
+        got_added, got_removed, got_changed = diff_namespaces(
+            [_param(*spec) for spec in p1], [_param(*spec) for spec in p2], "/prod", "/staging"
+        )
+        assert [p.path for p in got_added] == added
+        assert [p.path for p in got_removed] == removed
+        assert [(old.path, new.path) for old, new in got_changed] == changed
 
     def test_relative_key_matching(self):
         """Params match by relative path, not absolute path."""
@@ -103,3 +80,11 @@ class TestDiffNamespaces:
         assert added == []
         assert removed == []
         assert changed == []
+
+    def test_interleaved_keys_in_any_input_order(self):
+        p1 = [_param("/prod/d", "1"), _param("/prod/a", "1"), _param("/prod/c", "old")]
+        p2 = [_param("/staging/e", "1"), _param("/staging/c", "new"), _param("/staging/b", "1")]
+        added, removed, changed = diff_namespaces(p1, p2, "/prod", "/staging")
+        assert [p.path for p in added] == ["/staging/b", "/staging/e"]
+        assert [p.path for p in removed] == ["/prod/a", "/prod/d"]
+        assert [(o.path, n.path) for o, n in changed] == [("/prod/c", "/staging/c")]
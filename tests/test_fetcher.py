@@ -2,31 +2,22 @@
 
 from __future__ import annotations
 
-import os
-
-import boto3
 import pytest
-from moto import mock_aws
 
 from ssmtree.errors import sanitize_error as _sanitize_error
-from ssmtree.fetcher import FetchError, fetch_parameters
+from ssmtree.fetcher import FetchError, fetch_parameters, fetch_parameters_raw
 from ssmtree.models import Parameter
 
-
-@pytest.fixture(autouse=True)
-def aws_env():
-    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
-    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
-    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
-    os.environ.setdefault("AWS_SECURITY_TOKEN", "testing")
-    os.environ.setdefault("AWS_SESSION_TOKEN", "testing")
+pytestmark = [
+    pytest.mark.usefixtures("moto_ssm"),
+    pytest.mark.moto,
+    pytest.mark.xdist_group("moto"),
+]
 
 
-@mock_aws
-def test_fetch_basic():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/app/prod/db/host", Value="localhost", Type="String")
-    client.put_parameter(Name="/app/prod/db/port", Value="5432", Type="String")
+def test_fetch_basic(moto_client):
+    moto_client.put_parameter(Name="/app/prod/db/host", Value="localhost", Type="String")
+    moto_client.put_parameter(Name="/app/prod/db/port", Value="5432", Type="String")
 
     params = fetch_parameters("/app/prod")
 
@@ -36,11 +27,9 @@ def test_fetch_basic():
     assert "/app/prod/db/port" in paths
 
 
-@mock_aws
-def test_fetch_returns_sorted():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/z/b", Value="b", Type="String")
-    client.put_parameter(Name="/z/a", Value="a", Type="String")
+def test_fetch_returns_sorted(moto_client):
+    moto_client.put_parameter(Name="/z/b", Value="b", Type="String")
+    moto_client.put_parameter(Name="/z/a", Value="a", Type="String")
 
     params = fetch_parameters("/z")
 
@@ -48,10 +37,8 @@ def test_fetch_returns_sorted():
     assert params[1].path == "/z/b"
 
 
-@mock_aws
-def test_fetch_returns_parameter_objects():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/app/key", Value="myval", Type="String")
+def test_fetch_returns_parameter_objects(moto_client):
+    moto_client.put_parameter(Name="/app/key", Value="myval", Type="String")
 
     params = fetch_parameters("/app")
 
@@ -64,10 +51,8 @@ def test_fetch_returns_parameter_objects():
     assert p.type == "String"
 
 
-@mock_aws
-def test_fetch_secure_string_without_decrypt():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/app/secret", Value="mysecret", Type="SecureString")
+def test_fetch_secure_string_without_decrypt(moto_client):
+    moto_client.put_parameter(Name="/app/secret", Value="mysecret", Type="SecureString")
 
     # moto returns the value regardless of WithDecryption for SecureString,
     # but the type should still be SecureString
@@ -77,29 +62,24 @@ def test_fetch_secure_string_without_decrypt():
     assert params[0].type == "SecureString"
 
 
-@mock_aws
 def test_fetch_empty_prefix_returns_empty():
     # Nothing seeded under /nonexistent
     params = fetch_parameters("/nonexistent")
     assert params == []
 
 
-@mock_aws
-def test_fetch_name_is_leaf_segment():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/a/b/c/leaf", Value="v", Type="String")
+def test_fetch_name_is_leaf_segment(moto_client):
+    moto_client.put_parameter(Name="/a/b/c/leaf", Value="v", Type="String")
 
     params = fetch_parameters("/a")
 
     assert params[0].name == "leaf"
 
 
-@mock_aws
-def test_fetch_multiple_types():
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/x/str", Value="s", Type="String")
-    client.put_parameter(Name="/x/sec", Value="s", Type="SecureString")
-    client.put_parameter(Name="/x/lst", Value="a,b,c", Type="StringList")
+def test_fetch_multiple_types(moto_client):
+    moto_client.put_parameter(Name="/x/str", Value="s", Type="String")
+    moto_client.put_parameter(Name="/x/sec", Value="s", Type="SecureString")
+    moto_client.put_parameter(Name="/x/lst", Value="a,b,c", Type="StringList")
 
     params = fetch_parameters("/x")
     types = {p.name: p.type for p in params}
@@ -109,7 +89,6 @@ def test_fetch_multiple_types():
     assert types["lst"] == "StringList"
 
 
-@mock_aws
 def test_fetch_invalid_region_raises_fetch_error(monkeypatch):
     """Simulate a boto3/botocore error being raised as FetchError."""
     from botocore.exceptions import ClientError
@@ -132,11 +111,9 @@ def test_fetch_invalid_region_raises_fetch_error(monkeypatch):
         fetch_parameters("/app")
 
 
-@mock_aws
-def test_fetch_exact_leaf_parameter():
+def test_fetch_exact_leaf_parameter(moto_client):
     """get_parameters_by_path never returns a param AT the prefix; fallback should find it."""
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/test", Value="leaf-value", Type="String")
+    moto_client.put_parameter(Name="/test", Value="leaf-value", Type="String")
 
     params = fetch_parameters("/test")
 
@@ -146,12 +123,10 @@ def test_fetch_exact_leaf_parameter():
     assert params[0].value == "leaf-value"
 
 
-@mock_aws
-def test_fetch_exact_leaf_not_returned_when_children_also_exist():
+def test_fetch_exact_leaf_not_returned_when_children_also_exist(moto_client):
     """When /prefix has both itself and children, both should be returned."""
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/app", Value="root-value", Type="String")
-    client.put_parameter(Name="/app/key", Value="child-value", Type="String")
+    moto_client.put_parameter(Name="/app", Value="root-value", Type="String")
+    moto_client.put_parameter(Name="/app/key", Value="child-value", Type="String")
 
     params = fetch_parameters("/app")
     paths = {p.path for p in params}
@@ -160,18 +135,15 @@ def test_fetch_exact_leaf_not_returned_when_children_also_exist():
     assert "/app/key" in paths
 
 
-@mock_aws
 def test_fetch_nonexistent_leaf_returns_empty():
     """Querying a path that doesn't exist should return empty list, not raise."""
     params = fetch_parameters("/does/not/exist")
     assert params == []
 
 
-@mock_aws
-def test_fetch_exact_leaf_secure_string():
+def test_fetch_exact_leaf_secure_string(moto_client):
     """Fallback get_parameter should respect the decrypt flag for SecureString."""
-    client = boto3.client("ssm", region_name="us-east-1")
-    client.put_parameter(Name="/app/secret", Value="mysecret", Type="SecureString")
+    moto_client.put_parameter(Name="/app/secret", Value="mysecret", Type="SecureString")
 
     params = fetch_parameters("/app/secret", decrypt=False)
 
@@ -180,6 +152,132 @@ def test_fetch_exact_leaf_secure_string():
     assert params[0].path == "/app/secret"
 
 
+def test_fetch_large_namespace_spans_pages(moto_client):
+    for i in range(35):
+        moto_client.put_parameter(Name=f"/big/p{i:02d}", Value=str(i), Type="String")
+    moto_client.put_parameter(Name="/bigger/other", Value="x", Type="String")
+
+    params = fetch_parameters("/big")
+
+    assert [p.path for p in params] == [f"/big/p{i:02d}" for i in range(35)]
+    assert params[7].value == "7"
+
+
+def test_fetch_falls_back_to_paging_without_describe_permission(monkeypatch):
+    """Without ssm:DescribeParameters, remaining pages are walked via NextToken."""
+    from botocore.exceptions import ClientError
+
+    import ssmtree.fetcher as fetcher_module
+
+    pages = {
+        None: {"Parameters": [{"Name": "/app/a", "Value": "1"}], "NextToken": "t1"},
+        "t1": {"Parameters": [{"Name": "/app/b", "Value": "2"}], "NextToken": "t2"},
+        "t2": {"Parameters": [{"Name": "/app/c", "Value": "3"}]},
+    }
+
+    class PagingOnlyClient:
+        def get_parameters_by_path(self, **kwargs):
+            return pages[kwargs.get("NextToken")]
+
+        def get_paginator(self, name):
+            raise ClientError(
+                {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+                "DescribeParameters",
+            )
+
+        def get_parameter(self, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "ParameterNotFound", "Message": "missing"}}, "GetParameter"
+            )
+
+    monkeypatch.setattr(fetcher_module, "make_client", lambda *a: PagingOnlyClient())
+
+    params = fetch_parameters("/app")
+
+    assert [p.path for p in params] == ["/app/a", "/app/b", "/app/c"]
+
+
+@pytest.mark.parametrize("denied_from", [0, 20], ids=["all-batches", "later-batch"])
+def test_fetch_falls_back_to_paging_without_get_parameters_permission(monkeypatch, denied_from):
+    """Without ssm:GetParameters, the remaining pages are walked via NextToken instead."""
+    from botocore.exceptions import ClientError
+
+    import ssmtree.fetcher as fetcher_module
+
+    names = [f"/app/p{i:02d}" for i in range(25)]
+    pages = {}
+    for start in range(0, len(names), 10):
+        token = f"t{start}" if start else None
+        page = {"Parameters": [{"Name": n, "Value": n} for n in names[start : start + 10]]}
+        if start + 10 < len(names):
+            page["NextToken"] = f"t{start + 10}"
+        pages[token] = page
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            return [{"Parameters": [{"Name": n} for n in names]}]
+
+    class NoGetParametersClient:
+        def get_parameters_by_path(self, **kwargs):
+            return pages[kwargs.get("NextToken")]
+
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_parameters(self, **kwargs):
+            if any(int(n[-2:]) >= denied_from for n in kwargs["Names"]):
+                raise ClientError(
+                    {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+                    "GetParameters",
+                )
+            return {"Parameters": [{"Name": n, "Value": n} for n in kwargs["Names"]]}
+
+        def get_parameter(self, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "ParameterNotFound", "Message": "missing"}}, "GetParameter"
+            )
+
+    monkeypatch.setattr(fetcher_module, "make_client", lambda *a: NoGetParametersClient())
+
+    params = fetch_parameters("/app")
+
+    assert [p.path for p in params] == names
+
+
+def test_fetch_leaf_lookup_error_raises_fetch_error(monkeypatch):
+    """Errors other than ParameterNotFound from the leaf lookup are not swallowed."""
+    from botocore.exceptions import ClientError
+
+    import ssmtree.fetcher as fetcher_module
+
+    class LeafDeniedClient:
+        def get_parameters_by_path(self, **kwargs):
+            return {"Parameters": [{"Name": "/app/a", "Value": "1"}]}
+
+        def get_parameter(self, **kwargs):
+            raise ClientError(
+                {"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, "GetParameter"
+            )
+
+    monkeypatch.setattr(fetcher_module, "make_client", lambda *a: LeafDeniedClient())
+
+    with pytest.raises(FetchError, match="denied"):
+        fetch_parameters("/app")
+
+
+def test_fetch_raw_yields_parameter_shaped_dicts(moto_client):
+    moto_client.put_parameter(Name="/app/db/host", Value="localhost", Type="String")
+    moto_client.put_parameter(Name="/app", Value="root-value", Type="String")
+
+    records = sorted(fetch_parameters_raw("/app"), key=lambda r: r["path"])
+
+    assert [r["path"] for r in records] == ["/app", "/app/db/host"]
+    assert records[1]["name"] == "host"
+    assert records[1]["value"] == "localhost"
+    assert records[1]["type"] == "String"
+    assert set(records[1]) == {"path", "name", "value", "type", "version", "last_modified"}
+
+
 def test_make_client_invalid_profile_raises_client_creation_error():
     """An unknown --profile must raise ClientCreationError, not a raw traceback."""
     from ssmtree.errors import ClientCreationError
@@ -189,6 +287,48 @@ def test_make_client_invalid_profile_raises_client_creation_error():
         make_client("nonexistent-profile-xyz-123", "us-east-1")
 
 
+def test_make_client_reuses_client_for_same_arguments():
+    from ssmtree.fetcher import make_client
+
+    first = make_client(None, "us-east-1")
+    assert make_client(None, "us-east-1") is first
+    assert make_client(None, "us-west-2") is not first
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [(None, 16), ("4", 4), ("0", 1), ("lots", 16)],
+)
+def test_network_concurrency_from_env(monkeypatch, raw, expected):
+    from ssmtree._pool import _concurrency
+
+    if raw is None:
+        monkeypatch.delenv("SSMTREE_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("SSMTREE_CONCURRENCY", raw)
+    assert _concurrency() == expected
+
+
+def test_bounded_map_cancels_unstarted_calls_when_closed():
+    import threading
+
+    from ssmtree._pool import bounded_map, pool_size
+
+    calls = []
+    lock = threading.Lock()
+
+    def record(item):
+        with lock:
+            calls.append(item)
+        return item
+
+    results = bounded_map(record, range(1000))
+    assert next(results) == 0
+    results.close()
+
+    assert len(calls) <= pool_size()
+
+
 def test_fetch_invalid_profile_raises_fetch_error():
     """fetch_parameters wraps client-creation failures as FetchError."""
     with pytest.raises(FetchError):
@@ -212,3 +352,8 @@ class TestSanitizeError:
         msg = "Access denied for GetParametersByPath"
         result = _sanitize_error(msg)
         assert result == msg
+
+    def test_strips_arn_and_separate_account_id(self):
+        msg = "User arn:aws:iam::123456789012:user/bob in 210987654321 denied (code 403)"
+        result = _sanitize_error(msg)
+        assert result == "User arn:*** in *** denied (code 403)"
@@ -2,110 +2,153 @@
 
 from __future__ import annotations
 
+import functools
+import io
 from datetime import UTC, datetime
 
+import pytest
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 from rich.tree import Tree
 
-from ssmtree.formatters import _truncate, render_copy_plan, render_diff, render_tree
-from ssmtree.models import Parameter
+from ssmtree.formatters import _plain_value, render_copy_plan, render_diff, render_tree
+from ssmtree.models import Parameter, TreeNode
 from ssmtree.tree import build_tree
 
-
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+# Markup stays on: the formatters emit markup strings for namespace labels and
+# table cells, and those must render as their text rather than literally.
+_CONSOLE = Console(
+    file=io.StringIO(),
+    force_terminal=False,
+    width=120,
+    color_system=None,
+    no_color=True,
+    highlight=False,
+    emoji=False,
+    legacy_windows=False,
+)
+
+
+@functools.cache
 def _param(path: str, value: str = "val", type_: str = "String") -> Parameter:
-    segments = [s for s in path.split("/") if s]
     return Parameter(
         path=path,
-        name=segments[-1] if segments else path,
+        name=path.rpartition("/")[2] or path,
         value=value,
         type=type_,
         version=1,
-        last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+        last_modified=_FIXED_TS,
     )
 
 
 def _render_to_str(rich_obj) -> str:
     """Render a Rich renderable to a plain string."""
-    console = Console(force_terminal=False, width=200)
-    with console.capture() as cap:
-        console.print(rich_obj)
-    return cap.get()
+    _CONSOLE.file = buf = io.StringIO()
+    _CONSOLE.print(rich_obj)
+    return buf.getvalue()
 
 
-class TestTruncate:
-    def test_short_value_unchanged(self):
-        assert _truncate("hello") == "hello"
+def _app_tree(*params: Parameter) -> TreeNode:
+    """Return a one-level tree under ``/app`` holding *params*, without build_tree."""
+    root = TreeNode(name="/app", path="/app")
+    for param in params:
+        root.children[param.name] = TreeNode(name=param.name, path=param.path, parameter=param)
+    return root
+
+
+def _plain(cell) -> str:
+    """Return the visible text of a label or cell, which is either Text or a markup string."""
+    return cell.plain if isinstance(cell, Text) else Text.from_markup(cell).plain
+
 
-    def test_exact_max_unchanged(self):
-        v = "x" * 60
-        assert _truncate(v) == v
+def _tree_text(tree: Tree) -> str:
+    """Return every label in *tree*, one per line in pre-order, without rendering."""
+    labels = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        labels.append(_plain(node.label))
+        stack.extend(reversed(node.children))
+    return "\n".join(labels)
 
-    def test_long_value_truncated(self):
-        v = "x" * 61
-        result = _truncate(v)
-        assert result.endswith("…")
-        assert len(result) == 61  # 60 chars + ellipsis
 
-    def test_empty_string(self):
-        assert _truncate("") == ""
+def _table_text(table: Table) -> str:
+    """Return the headers and cells of *table*, one per line, without rendering."""
+    cells = [_plain(col.header) for col in table.columns]
+    cells += [_plain(cell) for col in table.columns for cell in col._cells]
+    return "\n".join(cells)
+
+
+class TestTruncate:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("hello", "hello"),
+            ("x" * 60, "x" * 60),
+            ("x" * 61, "x" * 60 + "…"),  # 60 chars + ellipsis
+            ("", ""),
+        ],
+        ids=["short-unchanged", "exact-max-unchanged", "long-truncated", "empty"],
+    )
+    def test_truncate(self, value, expected):
+        assert _plain_value(_param("/app/key", value)) == expected
 
 
 class TestRenderTree:
     def test_returns_rich_tree(self):
-        params = [_param("/app/key")]
-        root = build_tree(params, root_path="/app")
+        root = _app_tree(_param("/app/key"))
         result = render_tree(root)
         assert isinstance(result, Tree)
 
     def test_tree_contains_param_name(self):
-        params = [_param("/app/key", value="myvalue")]
-        root = build_tree(params, root_path="/app")
+        root = _app_tree(_param("/app/key", value="myvalue"))
         output = _render_to_str(render_tree(root))
         assert "key" in output
 
     def test_tree_shows_value_by_default(self):
-        params = [_param("/app/key", value="myvalue")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root, show_values=True))
+        root = _app_tree(_param("/app/key", value="myvalue"))
+        output = _tree_text(render_tree(root, show_values=True))
         assert "myvalue" in output
 
     def test_tree_hides_value_when_requested(self):
-        params = [_param("/app/key", value="myvalue")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root, show_values=False))
+        root = _app_tree(_param("/app/key", value="myvalue"))
+        output = _tree_text(render_tree(root, show_values=False))
         assert "myvalue" not in output
 
-    def test_secure_string_shows_redacted_without_decrypt(self):
-        # Simulates the common case: API returns ciphertext when WithDecryption=False.
-        # The formatter should always show [redacted] for SecureString when decrypt=False.
-        params = [_param("/app/secret", value="AQICAHi+ciphertext==", type_="SecureString")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root, show_values=True, decrypt=False))
-        assert "[redacted]" in output
-        assert "AQICAHi+ciphertext==" not in output
-
-    def test_secure_string_hides_value_entirely_when_show_values_false(self):
-        params = [_param("/app/secret", value="AQICAHi+ciphertext==", type_="SecureString")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root, show_values=False, decrypt=False))
-        assert "[redacted]" not in output
-        assert "AQICAHi+ciphertext==" not in output
-
-    def test_secure_string_shows_value_when_decrypted(self):
-        params = [_param("/app/secret", value="decrypted-value", type_="SecureString")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root, show_values=True, decrypt=True))
-        assert "decrypted-value" in output
-        assert "[redacted]" not in output
-
-    def test_namespace_node_appears_in_output(self):
-        params = [_param("/app/db/host")]
-        root = build_tree(params, root_path="/app")
-        output = _render_to_str(render_tree(root))
+    @pytest.mark.parametrize(
+        ("show_values", "decrypt", "present", "absent"),
+        [
+            # Without --decrypt the API returns ciphertext; it must always show as [redacted].
+            (True, False, ["[redacted]"], ["AQICAHi+ciphertext=="]),
+            (False, False, [], ["[redacted]", "AQICAHi+ciphertext=="]),
+            (True, True, ["AQICAHi+ciphertext=="], ["[redacted]"]),
+        ],
+        ids=["redacted-without-decrypt", "hidden-without-show-values", "shown-when-decrypted"],
+    )
+    def test_secure_string_value(self, show_values, decrypt, present, absent):
+        root = _app_tree(_param("/app/secret", value="AQICAHi+ciphertext==", type_="SecureString"))
+        output = _tree_text(render_tree(root, show_values=show_values, decrypt=decrypt))
+        for text in present:
+            assert text in output
+        for text in absent:
+            assert text not in output
+
+    def test_namespace_node_appears_in_output(self, tree_factory):
+        root = tree_factory((_param("/app/db/host"),), "/app")
+        output = _tree_text(render_tree(root))
         assert "db" in output
         assert "host" in output
 
+    def test_nested_nodes_render_in_name_order(self, tree_factory):
+        params = (_param("/app/z/b"), _param("/app/a/y"), _param("/app/z/a"), _param("/app/a/x"))
+        root = tree_factory(params, "/app")
+        output = _tree_text(render_tree(root, show_values=False))
+        assert output.splitlines()[1:] == [
+            "a", "x [String]", "y [String]", "z", "a [String]", "b [String]"
+        ]
+
     def test_empty_tree_renders(self):
         root = build_tree([], root_path="/")
         result = render_tree(root)
@@ -127,21 +170,21 @@ class TestRenderDiff:
     def test_removed_params_shown(self):
         removed = [_param("/a/old_key", value="oldval")]
         table = render_diff([], removed, [], "/a", "/b")
-        output = _render_to_str(table)
+        output = _table_text(table)
         assert "removed" in output
 
     def test_changed_params_shown(self):
         old = _param("/a/key", value="old")
         new = _param("/b/key", value="new")
         table = render_diff([], [], [(old, new)], "/a", "/b")
-        output = _render_to_str(table)
+        output = _table_text(table)
         assert "changed" in output
 
     def test_diff_hides_values_by_default(self):
         old = _param("/a/key", value="secret-old")
         new = _param("/b/key", value="secret-new")
         table = render_diff([], [], [(old, new)], "/a", "/b")
-        output = _render_to_str(table)
+        output = _table_text(table)
         assert "secret-old" not in output
         assert "secret-new" not in output
 
@@ -150,34 +193,25 @@ class TestRenderDiff:
         old = _param("/a/key", value="secret-old")
         new = _param("/b/key", value="secret-new")
         table = render_diff([], [], [(old, new)], "/a", "/b", show_values=True)
-        output = _render_to_str(table)
+        output = _table_text(table)
         assert "secret-old" in output
         assert "secret-new" in output
 
-    def test_diff_redacts_secure_strings_without_decrypt(self):
-        # All three status types should show [redacted] for SecureString without --decrypt
-        removed = _param("/a/pw", value="AQICAHiR==", type_="SecureString")
-        added = _param("/b/token", value="AQICAHiA==", type_="SecureString")
-        old = _param("/a/key", value="AQICAHiB==", type_="SecureString")
-        new = _param("/b/key", value="AQICAHiC==", type_="SecureString")
+    @pytest.mark.parametrize("decrypt", [False, True], ids=["redacted", "decrypted"])
+    def test_diff_secure_string_values(self, decrypt):
+        # All three status types must honour --decrypt for SecureString values
+        values = ["AQICAHiR==", "AQICAHiA==", "AQICAHiB==", "AQICAHiC=="]
+        removed, added, old, new = (
+            _param(path, value=value, type_="SecureString")
+            for path, value in zip(["/a/pw", "/b/token", "/a/key", "/b/key"], values)
+        )
         table = render_diff(
-            [added], [removed], [(old, new)], "/a", "/b", show_values=True, decrypt=False
+            [added], [removed], [(old, new)], "/a", "/b", show_values=True, decrypt=decrypt
         )
-        output = _render_to_str(table)
-        assert output.count("[redacted]") == 4
-        assert "AQICAHiR==" not in output
-        assert "AQICAHiA==" not in output
-        assert "AQICAHiB==" not in output
-        assert "AQICAHiC==" not in output
-
-    def test_diff_shows_secure_string_values_when_decrypted(self):
-        old = _param("/a/key", value="plaintext-old", type_="SecureString")
-        new = _param("/b/key", value="plaintext-new", type_="SecureString")
-        table = render_diff([], [], [(old, new)], "/a", "/b", show_values=True, decrypt=True)
-        output = _render_to_str(table)
-        assert "plaintext-old" in output
-        assert "plaintext-new" in output
-        assert "[redacted]" not in output
+        output = _table_text(table)
+        assert output.count("[redacted]") == (0 if decrypt else 4)
+        for value in values:
+            assert (value in output) is decrypt
 
 
 class TestRenderCopyPlan:
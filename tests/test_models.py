@@ -3,23 +3,27 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from types import MappingProxyType
 
 import pytest
 
 from ssmtree.models import Parameter, TreeNode
 
-
-def _make_param(**kwargs) -> Parameter:
-    defaults = {
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+_PARAM_DEFAULTS = MappingProxyType(
+    {
         "path": "/app/prod/db/host",
         "name": "host",
         "value": "localhost",
         "type": "String",
         "version": 1,
-        "last_modified": datetime(2024, 1, 1, tzinfo=UTC),
+        "last_modified": _FIXED_TS,
     }
-    defaults.update(kwargs)
-    return Parameter(**defaults)
+)
+
+
+def _make_param(**kwargs) -> Parameter:
+    return Parameter(**dict(_PARAM_DEFAULTS, **kwargs))
 
 
 class TestParameter:
@@ -38,6 +42,13 @@ class TestParameter:
         assert not p.is_secure
         assert p.is_string_list
 
+    def test_type_flags_follow_replace(self):
+        from dataclasses import replace
+
+        p = replace(_make_param(type="String"), type="SecureString")
+        assert p.is_secure
+        assert "is_secure" not in repr(p)
+
     def test_fields(self):
         p = _make_param(path="/a/b/c", name="c", value="val", version=42)
         assert p.path == "/a/b/c"
@@ -45,6 +56,15 @@ class TestParameter:
         assert p.value == "val"
         assert p.version == 42
 
+    def test_is_frozen_and_hashable(self):
+        from dataclasses import FrozenInstanceError
+
+        p = _make_param()
+        with pytest.raises(FrozenInstanceError):
+            p.value = "changed"
+        assert hash(p) == hash(_make_param())
+        assert not hasattr(p, "__dict__")
+
     def test_invalid_type_raises_value_error(self):
         with pytest.raises(ValueError, match="Invalid parameter type"):
             _make_param(type="InvalidType")
@@ -71,3 +91,9 @@ class TestTreeNode:
         p = _make_param()
         node = TreeNode(name="host", path="/app/prod/db/host", parameter=p)
         assert node.parameter is p
+
+    def test_is_slotted_with_independent_children(self):
+        first = TreeNode(name="a", path="/a")
+        second = TreeNode(name="b", path="/b")
+        assert not hasattr(first, "__dict__")
+        assert first.children is not second.children
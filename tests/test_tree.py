@@ -2,24 +2,48 @@
 
 from __future__ import annotations
 
+import functools
 from datetime import UTC, datetime
 
-from ssmtree.models import Parameter
+import pytest
+
+from ssmtree.models import Parameter, TreeNode
 from ssmtree.tree import build_tree, filter_tree
 
+_FIXED_TS = datetime(2024, 1, 1, tzinfo=UTC)
+
 
+@functools.cache
 def _param(path: str, value: str = "v", type_: str = "String") -> Parameter:
-    segments = [s for s in path.split("/") if s]
     return Parameter(
         path=path,
-        name=segments[-1] if segments else path,
+        name=path.rpartition("/")[2] or path,
         value=value,
         type=type_,
         version=1,
-        last_modified=datetime(2024, 1, 1, tzinfo=UTC),
+        last_modified=_FIXED_TS,
     )
 
 
+def _param_paths(node: TreeNode) -> list[str]:
+    """Return the paths of every parameter in the tree under *node*."""
+    found = [node.parameter.path] if node.parameter is not None else []
+    for child in node.children.values():
+        found.extend(_param_paths(child))
+    return found
+
+
+@pytest.fixture(scope="class")
+def canonical_tree() -> TreeNode:
+    """A small read-only tree shared by tests that only inspect its shape."""
+    params = [
+        _param("/app/prod/api/key"),
+        _param("/app/prod/db/host"),
+        _param("/app/prod/db/port"),
+    ]
+    return build_tree(params, root_path="/app/prod")
+
+
 class TestBuildTree:
     def test_empty_list_returns_root(self):
         root = build_tree([], root_path="/")
@@ -33,14 +57,8 @@ class TestBuildTree:
         assert "key" in root.children["app"].children
         assert root.children["app"].children["key"].parameter is not None
 
-    def test_nested_params(self):
-        params = [
-            _param("/app/prod/db/host"),
-            _param("/app/prod/db/port"),
-        ]
-        root = build_tree(params, root_path="/")
-
-        db_node = root.children["app"].children["prod"].children["db"]
+    def test_nested_params(self, canonical_tree):
+        db_node = canonical_tree.children["db"]
         assert "host" in db_node.children
         assert "port" in db_node.children
 
@@ -65,12 +83,19 @@ class TestBuildTree:
         assert prod_node.parameter.path == "/app/prod"
         assert "key" in prod_node.children
 
-    def test_root_path_prefix(self):
-        params = [_param("/app/prod/db/host")]
-        root = build_tree(params, root_path="/app/prod")
+    def test_param_at_intermediate_node_listed_after_children(self):
+        params = [_param("/app/prod/db/key"), _param("/app/prod/db"), _param("/app/prod")]
+        root = build_tree(params, root_path="/app")
 
-        assert "db" in root.children
-        assert "host" in root.children["db"].children
+        prod_node = root.children["prod"]
+        assert prod_node.parameter is not None
+        assert prod_node.children["db"].parameter is not None
+        assert prod_node.children["db"].parameter.path == "/app/prod/db"
+
+    def test_root_path_prefix(self, canonical_tree):
+        assert canonical_tree.path == "/app/prod"
+        assert "db" in canonical_tree.children
+        assert "host" in canonical_tree.children["db"].children
 
     def test_node_names_are_segments(self):
         params = [_param("/x/y/z")]
@@ -80,14 +105,9 @@ class TestBuildTree:
         assert root.children["x"].children["y"].name == "y"
         assert root.children["x"].children["y"].children["z"].name == "z"
 
-    def test_sibling_params(self):
-        params = [
-            _param("/ns/a"),
-            _param("/ns/b"),
-            _param("/ns/c"),
-        ]
-        root = build_tree(params, root_path="/ns")
-        assert set(root.children.keys()) == {"a", "b", "c"}
+    def test_sibling_params(self, canonical_tree):
+        assert set(canonical_tree.children.keys()) == {"api", "db"}
+        assert set(canonical_tree.children["db"].children.keys()) == {"host", "port"}
 
     def test_params_outside_root_ignored(self):
         params = [
@@ -99,54 +119,90 @@ class TestBuildTree:
         assert "other" not in root.children
         assert "key" in root.children
 
-    def test_leaf_node_is_leaf(self):
-        params = [_param("/app/key")]
+    def test_leaf_node_is_leaf(self, canonical_tree):
+        assert canonical_tree.children["db"].children["host"].is_leaf
+
+    def test_namespace_node_is_namespace(self, canonical_tree):
+        assert canonical_tree.children["db"].is_namespace
+
+    def test_intermediate_node_paths(self):
+        for root_path, expected in [("/", "/app/prod/db"), ("/app", "/app/prod/db")]:
+            root = build_tree([_param("/app/prod/db/host")], root_path=root_path)
+            node = root
+            while node.name != "db":
+                node = next(iter(node.children.values()))
+            assert node.path == expected
+            assert node.children["host"].path == "/app/prod/db/host"
+
+    def test_flat_names_are_joined_onto_root(self):
+        root = build_tree([_param("foo"), _param("bar/baz")], root_path="/")
+        assert root.children["foo"].path == "/foo"
+        assert root.children["foo"].parameter is not None
+        assert root.children["bar"].path == "/bar"
+        assert root.children["bar"].children["baz"].path == "/bar/baz"
+
+    def test_children_are_ordered_by_name(self):
+        params = [_param("/app/b/x"), _param("/app/b-c"), _param("/app/a"), _param("/app/b/w")]
         root = build_tree(params, root_path="/app")
-        assert root.children["key"].is_leaf
+        assert list(root.children) == ["a", "b", "b-c"]
+        assert list(root.children["b"].children) == ["w", "x"]
 
-    def test_namespace_node_is_namespace(self):
-        params = [_param("/app/db/host")]
-        root = build_tree(params, root_path="/app")
-        assert root.children["db"].is_namespace
+    def test_flat_and_rooted_children_are_ordered_together(self):
+        root = build_tree([_param("/zed"), _param("foo"), _param("/abc")], root_path="/")
+        assert list(root.children) == ["abc", "foo", "zed"]
 
 
 class TestFilterTree:
-    def test_filter_matching_path(self):
-        params = [
-            _param("/app/prod/db/host"),
-            _param("/app/prod/api/key"),
-        ]
-        root = build_tree(params, root_path="/app/prod")
-        filtered = filter_tree(root, "*/db/*")
+    def test_filter_matching_path(self, canonical_tree):
+        filtered = filter_tree(canonical_tree, "*/db/*")
         assert "db" in filtered.children
         assert "api" not in filtered.children
 
-    def test_filter_no_match_returns_empty_root(self):
+    def test_filter_no_match_returns_empty_root(self, tree_factory):
         params = [_param("/app/prod/db/host")]
-        root = build_tree(params, root_path="/app/prod")
+        root = tree_factory(tuple(params), "/app/prod")
         filtered = filter_tree(root, "*/nonexistent/*")
         assert filtered.children == {}
 
-    def test_filter_glob_star(self):
+    def test_filter_glob_star(self, tree_factory):
         params = [
             _param("/app/prod/db_host"),
             _param("/app/prod/db_port"),
             _param("/app/prod/api_key"),
         ]
-        root = build_tree(params, root_path="/app/prod")
+        root = tree_factory(tuple(params), "/app/prod")
         filtered = filter_tree(root, "*/db_*")
         child_names = set(filtered.children.keys())
         assert "db_host" in child_names
         assert "db_port" in child_names
         assert "api_key" not in child_names
 
-    def test_filter_preserves_structure(self):
-        params = [
-            _param("/app/prod/db/host"),
-            _param("/app/prod/db/port"),
-        ]
-        root = build_tree(params, root_path="/app/prod")
-        filtered = filter_tree(root, "*host*")
+    def test_filter_preserves_structure(self, canonical_tree):
+        filtered = filter_tree(canonical_tree, "*host*")
         assert "db" in filtered.children
         assert "host" in filtered.children["db"].children
         assert "port" not in filtered.children["db"].children
+
+    def test_filter_agrees_with_fnmatch(self, tree_factory):
+        import fnmatch
+
+        paths = ["/app/prod/db/host", "/app/prod/db/port", "/app/prod/api/key", "/app/prod/x.y"]
+        root = tree_factory(tuple(_param(p) for p in paths), "/app/prod")
+        for pattern in [
+            "*/db/[hp]o*", "*/api/?ey", "*.y", "*[!t]",
+            "/app/prod/db/host", "/app/prod/db", "/app/prod/*", "/app/prod/db/*", "/app/pro/*",
+            "/app/prod/d*", "/app/prod/db/h?st", "/app/prod/db/hostx*",
+        ]:
+            filtered = filter_tree(root, pattern)
+            kept = sorted(_param_paths(filtered))
+            assert kept == sorted(p for p in paths if fnmatch.fnmatch(p, pattern)), pattern
+
+    def test_filter_deep_tree_without_recursion(self, tree_factory):
+        deep = "/r" + "/n" * 1200 + "/leaf"
+        root = tree_factory((_param(deep), _param("/r/other")), "/r")
+        filtered = filter_tree(root, "*/leaf")
+        node = filtered
+        while node.children:
+            assert len(node.children) == 1
+            node = next(iter(node.children.values()))
+        assert node.parameter is not None and node.parameter.path == deep